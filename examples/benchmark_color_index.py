@@ -0,0 +1,46 @@
+"""
+Benchmark for color and aspect-ratio queries over a large photo index
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to Python path to import the package
+sys.path.append(str(Path(__file__).parent.parent))
+from notunsplash import ColorIndex, Photo
+
+SHAPES = [(6000, 4000), (4000, 6000), (1920, 1080), (3000, 3000), (5472, 3648), (4032, 3024)]
+
+def make_photo(index: int) -> Photo:
+    """Build a photo with a random color and a common camera shape"""
+    width, height = random.choice(SHAPES)
+    return Photo({
+        "id": f"photo-{index}",
+        "width": width,
+        "height": height,
+        "color": f"#{random.randrange(0x1000000):06x}",
+    })
+
+def main():
+    num_photos = 300_000
+    photos = [make_photo(i) for i in range(num_photos)]
+
+    index = ColorIndex()
+    start = time.perf_counter()
+    for offset in range(0, num_photos, 30):  # one search page at a time
+        index.add(photos[offset:offset + 30])
+    print(f"Indexed {len(index)} photos in {time.perf_counter() - start:.2f}s")
+
+    for label, aspect_ratio in (("any shape", None), ("16:9 slot", 16 / 9)):
+        runs = 50
+        start = time.perf_counter()
+        for _ in range(runs):
+            results = index.query("#1a73e8", aspect_ratio=aspect_ratio, k=10)
+        elapsed = (time.perf_counter() - start) / runs
+        print(f"Top-10 for brand color, {label}: {elapsed * 1000:.1f} ms per query")
+    for photo, distance in results[:3]:
+        print(f"  {photo.id} {photo.color} {photo.width}x{photo.height} dE={distance:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark for perceptual-hash de-duplication over tens of thousands of photos
+"""
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to Python path to import the package
+sys.path.append(str(Path(__file__).parent.parent))
+import numpy as np
+from PIL import Image, ImageEnhance
+from notunsplash import Deduplicator, Photo
+
+def make_thumb(rng: np.random.Generator) -> Image.Image:
+    """Build a smooth random image resembling a 200px-wide thumbnail"""
+    coarse = rng.integers(0, 256, size=(6, 9, 3), dtype=np.uint8)
+    return Image.fromarray(coarse).resize((200, 133), Image.BICUBIC)
+
+def encode(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+def main():
+    num_originals = 15_000
+    num_near_duplicates = 5_000
+    rng = np.random.default_rng(0)
+
+    thumbs = {}
+    originals = []
+    for i in range(num_originals):
+        image = make_thumb(rng)
+        originals.append(image)
+        thumbs[f"photo-{i}"] = encode(image)
+    for i in range(num_near_duplicates):
+        # Same shot, slightly brighter and recompressed
+        source = random.choice(originals)
+        thumbs[f"dup-{i}"] = encode(ImageEnhance.Brightness(source).enhance(1.08))
+
+    photos = [Photo({"id": photo_id}) for photo_id in thumbs]
+    random.shuffle(photos)
+
+    for method in ("dhash", "phash"):
+        dedup = Deduplicator(method=method, threshold=8, fetch=lambda photo: thumbs[photo.id])
+        start = time.perf_counter()
+        dedup.hash_photos(photos)
+        hashed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kept = sum(1 for _ in dedup.filter(photos, batch_size=256))
+        filtered = time.perf_counter() - start
+
+        print(
+            f"{method}: hashed {len(photos)} thumbnails in {hashed:.1f}s "
+            f"({len(photos) / hashed:,.0f}/s), filtered in {filtered:.2f}s from the hash cache, "
+            f"kept {kept} of {len(photos)} ({len(photos) - kept} dropped)"
+        )
+
+if __name__ == "__main__":
+    main()
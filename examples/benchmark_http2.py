@@ -0,0 +1,72 @@
+"""
+Benchmark comparing HTTP/1.1 and HTTP/2 transports against a local server
+
+Requires: pip install notunsplash[http2] hypercorn
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to Python path to import the package
+sys.path.append(str(Path(__file__).parent.parent))
+from notunsplash import Unsplash, RequestsTransport, HTTP2Transport
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+PORT = 8765
+LATENCY = 0.02  # simulated upstream processing time per request
+connections = set()
+
+async def app(scope, receive, send):
+    """Minimal ASGI app answering every request with a photo payload"""
+    if scope["type"] != "http":
+        return
+    connections.add(scope["client"])
+    await asyncio.sleep(LATENCY)
+    photo_id = scope["path"].rsplit("/", 1)[-1]
+    body = json.dumps({"id": photo_id, "width": 6000, "height": 4000}).encode()
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+def start_server() -> None:
+    """Run the test server (HTTP/1.1 and cleartext HTTP/2) in a daemon thread"""
+    config = Config()
+    config.bind = [f"127.0.0.1:{PORT}"]
+    config.loglevel = "WARNING"
+
+    async def never():
+        await asyncio.Event().wait()  # serve until the process exits
+
+    def run_server():
+        asyncio.run(serve(app, config, shutdown_trigger=never))
+
+    thread = threading.Thread(target=run_server, daemon=True)
+    thread.start()
+    time.sleep(1)
+
+def run(label: str, transport, num_requests: int = 200, workers: int = 32) -> None:
+    """Fan out get_photo calls through the transport and report the results"""
+    client = Unsplash(access_key="benchmark", api_base_url=f"http://127.0.0.1:{PORT}",
+                      transport=transport)
+    connections.clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(client.get_photo, (f"photo-{i}" for i in range(num_requests))))
+    elapsed = time.perf_counter() - start
+    client.close()
+    print(f"{label:<10} {elapsed * 1000:7.0f} ms for {num_requests} requests, "
+          f"{len(connections)} connections")
+
+def main():
+    start_server()
+    run("HTTP/1.1", RequestsTransport(pool_maxsize=32))
+    run("HTTP/2", HTTP2Transport(prior_knowledge=True, max_connections=1))
+
+if __name__ == "__main__":
+    main()
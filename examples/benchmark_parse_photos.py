@@ -0,0 +1,50 @@
+"""
+Benchmark showing how bulk photo parsing scales with worker processes
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to Python path to import the package
+sys.path.append(str(Path(__file__).parent.parent))
+from notunsplash import parse_photos
+
+def make_payload(index: int) -> bytes:
+    """Build an archived payload shaped like Photo._raw"""
+    return json.dumps({
+        "id": f"photo-{index}",
+        "created_at": "2024-01-15T10:30:00-05:00",
+        "updated_at": "2024-03-02T08:12:45-05:00",
+        "width": 6000,
+        "height": 4000,
+        "color": "#26402c",
+        "likes": index % 1000,
+        "urls": {size: f"https://images.unsplash.com/photo-{index}?w={size}"
+                 for size in ("raw", "full", "regular", "small", "thumb")},
+        "links": {"html": f"https://unsplash.com/photos/photo-{index}"},
+        "user": {"id": f"user-{index % 500}", "username": f"user{index % 500}"},
+        "exif": {"make": "Canon", "model": "EOS R5", "iso": 100},
+        "location": {"name": "Somewhere", "city": "City", "country": "Country"},
+    }).encode()
+
+def main():
+    num_payloads = 100_000
+    payloads = [make_payload(i) for i in range(num_payloads)]
+
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        count = sum(1 for _ in parse_photos(payloads, workers=workers))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:<3} {count / elapsed:>10,.0f} photos/s  "
+            f"speedup {baseline / elapsed:.1f}x"
+        )
+        workers *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark showing the memory saved by interning users across photos
+"""
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add the parent directory to Python path to import the package
+sys.path.append(str(Path(__file__).parent.parent))
+from notunsplash import Photo, UserIdentityMap
+
+def make_payload(index: int, num_photographers: int) -> dict:
+    """Build a search result shaped like a real /search/photos entry"""
+    user_id = f"user-{index % num_photographers}"
+    return {
+        "id": f"photo-{index}",
+        "created_at": "2024-01-15T10:30:00Z",
+        "width": 6000,
+        "height": 4000,
+        "color": "#26402c",
+        "urls": {size: f"https://images.unsplash.com/photo-{index}?w={size}"
+                 for size in ("raw", "full", "regular", "small", "thumb")},
+        "links": {"html": f"https://unsplash.com/photos/photo-{index}"},
+        "user": {
+            "id": user_id,
+            "username": f"photographer_{user_id}",
+            "name": f"Photographer {user_id.title()}",
+            "bio": "Landscape and travel photographer based somewhere scenic. " * 3,
+            "location": "Somewhere, Earth",
+            "links": {
+                "html": f"https://unsplash.com/@{user_id}",
+                "photos": f"https://api.unsplash.com/users/{user_id}/photos",
+                "likes": f"https://api.unsplash.com/users/{user_id}/likes",
+                "portfolio": f"https://api.unsplash.com/users/{user_id}/portfolio",
+            },
+            "profile_image": {
+                "small": f"https://images.unsplash.com/profile-{user_id}?w=32",
+                "medium": f"https://images.unsplash.com/profile-{user_id}?w=64",
+                "large": f"https://images.unsplash.com/profile-{user_id}?w=128",
+            },
+        },
+    }
+
+def measure(payloads: list, users=None) -> int:
+    """Return the bytes retained by the photos built from the payloads"""
+    tracemalloc.start()
+    photos = [Photo(payload, users) for payload in payloads]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del photos
+    return current
+
+def main():
+    num_photos = 30 * 100  # 100 pages of 30 results
+    num_photographers = 150
+    payloads = [make_payload(i, num_photographers) for i in range(num_photos)]
+
+    plain = measure(payloads)
+    users = UserIdentityMap()
+    interned = measure(payloads, users)
+
+    print(f"{num_photos} photos from {num_photographers} photographers")
+    print(f"Without interning: {plain / 1024:.0f} KiB")
+    print(f"With interning:    {interned / 1024:.0f} KiB")
+    print(f"Saved:             {(plain - interned) / plain:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,19 @@ A Python wrapper for the Unsplash API
 """
 
 from .client import Unsplash
-from .models import Photo, Collection, User, Topic
+from .models import Photo, Collection, User, Topic, Statistics, UserIdentityMap
 from .attribution import Attribution
-from .errors import UnsplashError, UnsplashAuthError
+from .parsing import parse_photos
+from .frame import PhotoFrame
+from .similarity import ColorIndex
+from .transport import Transport, RequestsTransport, HTTP2Transport
+from .imagecache import ImageCache, Derivative
+from .cassette import RecordingTransport, ReplayTransport, run_load
+from .cache import QueryCache
+from .writes import WriteBehindQueue
+from .hedging import HedgePolicy
+from .dedup import Deduplicator
+from .errors import UnsplashError, UnsplashAuthError, UnsplashTimeoutError, UnsplashConnectionError, UnsplashBatchError
 
 __version__ = "0.1.0"
-__all__ = ["Unsplash", "Photo", "Collection", "User", "Topic", "Attribution", "UnsplashError", "UnsplashAuthError"]
+__all__ = ["Unsplash", "Photo", "Collection", "User", "Topic", "Statistics", "UserIdentityMap", "Attribution", "parse_photos", "PhotoFrame", "ColorIndex", "Transport", "RequestsTransport", "HTTP2Transport", "ImageCache", "Derivative", "RecordingTransport", "ReplayTransport", "run_load", "QueryCache", "WriteBehindQueue", "HedgePolicy", "Deduplicator", "UnsplashError", "UnsplashAuthError", "UnsplashTimeoutError", "UnsplashConnectionError", "UnsplashBatchError"]
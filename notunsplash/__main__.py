@@ -0,0 +1,5 @@
+"""Allow running the command line interface with python -m notunsplash"""
+import sys
+from .cli import main
+
+sys.exit(main())
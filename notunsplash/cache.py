@@ -0,0 +1,228 @@
+"""Response cache with stale-while-revalidate and background warming"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+class _Entry:
+    """Cached value together with the function that refreshes it"""
+    def __init__(self, value: Any, fetch: Callable[[], Any]):
+        self.value = value
+        self.fetch = fetch
+        self.fetched_at = time.monotonic()
+
+class QueryCache:
+    """In-memory cache for API responses that keeps popular queries warm
+
+    Fresh entries (younger than ``ttl``) are served directly. Stale entries
+    (younger than ``stale_ttl``) are served immediately while a background
+    refresh runs. A warmer thread tracks how often each query is requested
+    and refreshes the hottest ones shortly before they expire, spending at
+    most ``refresh_share`` of the hourly rate limit on those refreshes.
+    """
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        stale_ttl: float = 3600.0,
+        max_entries: int = 1000,
+        hot_size: int = 200,
+        refresh_ahead: float = 0.8,
+        refresh_share: float = 0.1,
+        hourly_limit: int = 50,
+        workers: int = 2,
+        interval: float = 5.0
+    ):
+        """Initialize the cache
+
+        Args:
+            ttl: Seconds an entry is served without revalidation
+            stale_ttl: Seconds an entry may still be served while it is revalidated
+            max_entries: Maximum number of cached queries (least recently used go first)
+            hot_size: Number of most requested queries the warmer keeps fresh
+            refresh_ahead: Fraction of ttl after which the warmer refreshes a hot entry
+            refresh_share: Fraction of the hourly rate limit the warmer may use
+            hourly_limit: Requests per hour allowed by the API key. The client
+                updates this from the X-Ratelimit-Limit response header
+            workers: Number of background refresh threads
+            interval: Seconds between warmer passes
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.hot_size = hot_size
+        self.refresh_ahead = refresh_ahead
+        self.refresh_share = refresh_share
+        self.hourly_limit = hourly_limit
+        self.interval = interval
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "revalidations": 0, "warmed": 0}
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._frequency: Dict[Hashable, float] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notunsplash-cache")
+        self._tokens = 0.0
+        self._refilled_at = time.monotonic()
+        self._stop = threading.Event()
+        self._warmer: Optional[threading.Thread] = None
+        self._closed = False
+
+    def get(self, key: Hashable, fetch: Callable[[], Any], load: Optional[Callable[[], Any]] = None) -> Any:
+        """Return the cached value for key, calling fetch on a miss
+
+        Args:
+            key: Hashable description of the query
+            fetch: Zero-argument function that performs the request; kept
+                for background refreshes
+            load: Used instead of fetch for this call's own miss, e.g. to
+                apply the caller's deadline
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._frequency[key] = self._frequency.get(key, 0.0) + 1.0
+            if len(self._frequency) > 2 * self.max_entries:
+                self._prune_frequency()
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry.value
+                if age < self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["stale_hits"] += 1
+                    self._schedule_refresh(key, entry)
+                    return entry.value
+            self.stats["misses"] += 1
+
+        value = (load or fetch)()
+        self._store(key, value, fetch)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one cached query, or all of them when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._frequency.clear()
+            else:
+                self._entries.pop(key, None)
+                self._frequency.pop(key, None)
+
+    def hot_keys(self) -> List[Hashable]:
+        """Cached queries ordered from most to least requested"""
+        with self._lock:
+            cached = [key for key in self._frequency if key in self._entries]
+            cached.sort(key=self._frequency.__getitem__, reverse=True)
+            return cached[:self.hot_size]
+
+    def start(self) -> None:
+        """Start the background warmer thread (no-op once closed)"""
+        if self._closed or (self._warmer is not None and self._warmer.is_alive()):
+            return
+        self._stop.clear()
+        self._warmer = threading.Thread(target=self._run, name="notunsplash-warmer", daemon=True)
+        self._warmer.start()
+
+    def stop(self) -> None:
+        """Stop the background warmer thread"""
+        self._stop.set()
+        if self._warmer is not None:
+            self._warmer.join()
+            self._warmer = None
+
+    def close(self) -> None:
+        """Stop the warmer and wait for in-flight refreshes
+
+        A closed cache keeps serving entries, but no longer revalidates
+        stale ones in the background.
+        """
+        with self._lock:
+            self._closed = True
+        self.stop()
+        self._executor.shutdown(wait=True)
+
+    def warm(self) -> int:
+        """Refresh hot entries close to expiry, within the refresh budget
+
+        Called periodically by the warmer thread; can also be called directly.
+
+        Returns:
+            Number of refreshes scheduled
+        """
+        now = time.monotonic()
+        scheduled = 0
+        for key in self.hot_keys():
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or now - entry.fetched_at < self.ttl * self.refresh_ahead:
+                    continue
+                if not self._take_token(now):
+                    break
+                if self._schedule_refresh(key, entry):
+                    self.stats["warmed"] += 1
+                    scheduled += 1
+        self._decay()
+        return scheduled
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.warm()
+
+    def _take_token(self, now: float) -> bool:
+        """Token bucket holding the warmer to its share of the hourly limit"""
+        per_second = self.hourly_limit * self.refresh_share / 3600.0
+        capacity = max(1.0, per_second * self.interval)
+        self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * per_second)
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _decay(self) -> None:
+        """Age request counts so the hot set follows current traffic"""
+        with self._lock:
+            for key in list(self._frequency):
+                count = self._frequency[key] * 0.99
+                if count < 0.01 and key not in self._entries:
+                    del self._frequency[key]
+                else:
+                    self._frequency[key] = count
+
+    def _schedule_refresh(self, key: Hashable, entry: _Entry) -> bool:
+        """Refresh an entry in the background unless already in progress (lock held)"""
+        if self._closed or key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        self.stats["revalidations"] += 1
+        self._executor.submit(self._refresh, key, entry.fetch)
+        return True
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]) -> None:
+        try:
+            self._store(key, fetch(), fetch)
+        except Exception:
+            pass  # keep serving the stale value; the next request retries
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value, fetch)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._frequency.pop(evicted, None)
+
+    def _prune_frequency(self) -> None:
+        """Forget counts for queries that are not cached (lock held)
+
+        Keeps request counts bounded when many queries miss without being
+        stored (e.g. failing requests) and the warmer is not running.
+        """
+        for key in [key for key in self._frequency if key not in self._entries]:
+            del self._frequency[key]
@@ -0,0 +1,209 @@
+"""Record and replay API traffic for offline load testing
+
+A RecordingTransport wraps a real transport and writes every request and
+response, with its latency, to a cassette file (gzip-compressed NDJSON when
+the path ends in ``.gz``). A ReplayTransport serves those responses back
+without touching the network, each after its recorded (or a scaled)
+latency, and run_load drives a workload through it with a fixed number of
+threads. Replay reproduces per-request latency only: when requests arrive
+is up to the workload, not the recording.
+
+Only completed responses are recorded. Requests that raised, such as
+timeouts and connection errors, leave no entry, so replay cannot
+reproduce those failures; replaying a request that was never answered
+raises UnsplashError.
+Request headers and bodies are never recorded, and credential fields
+(``access_token``, ``refresh_token``, ``client_secret``, ...) are redacted
+from JSON responses and query parameters, as are ``Set-Cookie`` headers.
+Review cassettes before sharing them all the same: other response content,
+such as a private ``/me`` profile, is kept as recorded.
+"""
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .errors import UnsplashError
+from .transport import Transport, TransportResponse
+from .utils import percentile
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+# Fields whose values are credentials and must not reach a cassette
+_SECRET_FIELDS = {"access_token", "refresh_token", "id_token", "client_secret", "client_id"}
+_REDACTED = "[REDACTED]"
+
+def _redact(value):
+    """Copy of a JSON value with credential fields replaced"""
+    if isinstance(value, dict):
+        return {
+            key: _REDACTED if key in _SECRET_FIELDS else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+def _redact_body(content: bytes) -> bytes:
+    """Redact credential fields from a JSON body; other bodies are unchanged"""
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return content
+    redacted = _redact(body)
+    if redacted == body:
+        return content
+    return json.dumps(redacted).encode("utf-8")
+
+def _request_key(method: str, url: str, params: Optional[Dict]) -> Tuple:
+    params = _redact(dict(params or {}))
+    return (method.upper(), url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+class RecordingTransport(Transport):
+    """Transport that records traffic passing through another transport"""
+    def __init__(self, inner: Transport, path: str):
+        """Initialize the recorder
+
+        Args:
+            inner: Transport that performs the real requests
+            path: Cassette file to write (``.gz`` for compression)
+        """
+        self.inner = inner
+        self.path = path
+        self._file = _open(path, "w")
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        started = time.monotonic()
+        response = self.inner.request(
+            method, url, headers=headers, params=params, data=data, timeout=timeout
+        )
+        elapsed = time.monotonic() - started
+        entry = {
+            "elapsed": round(elapsed, 6),
+            "method": method.upper(),
+            "url": url,
+            "params": _redact(dict(params or {})),
+            "status": response.status_code,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() != "set-cookie"
+            },
+        }
+        try:
+            entry["body"] = _redact_body(response.content).decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(response.content).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.inner.close()
+
+class ReplayTransport(Transport):
+    """Transport that serves responses from a cassette
+
+    Requests are matched on method, URL and query parameters. When the same
+    request was recorded several times, the recordings are served in order
+    and then cycled, so a short cassette can drive a long load test.
+    """
+    def __init__(self, path: str, speed: float = 1.0):
+        """Initialize the replayer
+
+        Args:
+            path: Cassette file written by RecordingTransport
+            speed: Latency scale factor. 1.0 reproduces recorded latencies,
+                2.0 halves them, and 0 replies immediately
+        """
+        self.speed = speed
+        self._entries: Dict[Tuple, deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+        with _open(path, "r") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = _request_key(entry["method"], entry["url"], entry["params"])
+                    self._entries[key].append(entry)
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        key = _request_key(method, url, params)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise UnsplashError(f"No recorded response for {method.upper()} {url}")
+            entry = entries[0]
+            entries.rotate(-1)
+        if self.speed:
+            time.sleep(entry["elapsed"] / self.speed)
+        if "body_b64" in entry:
+            content = base64.b64decode(entry["body_b64"])
+        else:
+            content = entry["body"].encode("utf-8")
+        return TransportResponse(entry["status"], content, entry["headers"])
+
+class LoadReport:
+    """Throughput and latency summary of a load run"""
+    def __init__(self, latencies: List[float], errors: int, duration: float):
+        self.latencies = latencies
+        self.errors = errors
+        self.duration = duration
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        return percentile(self.latencies, fraction)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} calls ({self.errors} errors) in {self.duration:.2f}s, "
+            f"{self.throughput:.1f}/s, p50 {self.percentile(0.5) * 1000:.1f} ms, "
+            f"p95 {self.percentile(0.95) * 1000:.1f} ms, p99 {self.percentile(0.99) * 1000:.1f} ms"
+        )
+
+def run_load(call: Callable, arguments: Iterable, concurrency: int = 8) -> LoadReport:
+    """Run call(argument) for every argument on a thread pool and time it
+
+    Args:
+        call: Function to exercise, typically a client method or a function
+            of your own stack built on a client using ReplayTransport
+        arguments: One argument per call
+        concurrency: Number of calls in flight at once
+
+    Returns:
+        LoadReport with per-call latencies and the error count
+    """
+    def timed(argument):
+        started = time.perf_counter()
+        try:
+            call(argument)
+            failed = False
+        except Exception:
+            failed = True
+        return time.perf_counter() - started, failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, arguments))
+    duration = time.perf_counter() - started
+    return LoadReport(
+        [latency for latency, _ in results],
+        sum(1 for _, failed in results if failed),
+        duration
+    )
@@ -0,0 +1,290 @@
+"""Command line interface for bulk operations
+
+Every subcommand runs its requests on a worker pool, writes one JSON object
+per line to stdout and reports throughput and latency on stderr. Commands
+that take photos read ids (or NDJSON lines from search-export) from their
+arguments or stdin, so they can be piped together::
+
+    notunsplash search-export nature --pages 5 | notunsplash download --output images/
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from .client import Unsplash
+from .errors import UnsplashError
+from .models import Photo
+from .transport import RequestsTransport
+from .utils import percentile
+
+class RateLimiter:
+    """Spaces requests to at most ``rate`` per second across threads"""
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+class Reporter:
+    """Collects per-job latencies and prints live progress to stderr"""
+    def __init__(self, interval: float = 1.0, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "Reporter":
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.stream.write(f"done: {self.summary()}\n")
+
+    def record(self, latency: float, failed: bool) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            if failed:
+                self.errors += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            latencies = list(self.latencies)
+            errors = self.errors
+        elapsed = time.perf_counter() - self._started
+        rate = len(latencies) / elapsed if elapsed else 0.0
+        return (
+            f"{len(latencies)} jobs, {errors} errors, {rate:.1f}/s, "
+            f"p50 {percentile(latencies, 0.5) * 1000:.0f} ms, "
+            f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms"
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.stream.write(f"\r{self.summary()}")
+            self.stream.flush()
+        self.stream.write("\r")
+
+def run_jobs(
+    job: Callable,
+    items: Iterable,
+    workers: int,
+    limiter: RateLimiter,
+    reporter: Reporter,
+    client: Unsplash,
+    reserve: int = 0,
+    output=None
+) -> None:
+    """Run job(item) on a worker pool and write each result as an NDJSON line
+
+    A job returning a list produces one line per element. A job that
+    raises produces an ``{"item": ..., "error": ...}`` line instead.
+
+    No new jobs are started once the API reports ``reserve`` or fewer
+    requests left in the current rate-limit window.
+
+    Raises:
+        OSError: If writing to output fails (e.g. a closed pipe). Jobs not
+            yet started are skipped instead of spending rate limit
+    """
+    output = output or sys.stdout
+    write_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(workers * 2)
+    stop = threading.Event()
+    output_errors: List[BaseException] = []
+
+    def run(item):
+        if stop.is_set():
+            slots.release()
+            return
+        started = time.perf_counter()
+        try:
+            result = job(item)
+            failed = False
+        except Exception as e:
+            result = {"item": item if isinstance(item, str) else getattr(item, "id", None), "error": str(e)}
+            failed = True
+        finally:
+            slots.release()
+        reporter.record(time.perf_counter() - started, failed)
+        results = result if isinstance(result, list) else [result]
+        lines = "".join(json.dumps(value, default=str) + "\n" for value in results)
+        with write_lock:
+            output.write(lines)
+            output.flush()
+
+    def done(future):
+        error = future.exception()
+        if error is not None:
+            output_errors.append(error)
+            stop.set()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            if stop.is_set():
+                break
+            remaining = client.rate_limit_remaining
+            if remaining is not None and remaining <= reserve:
+                sys.stderr.write(f"\nStopping: {remaining} requests left in the rate-limit window\n")
+                break
+            slots.acquire()
+            limiter.wait()
+            executor.submit(run, item).add_done_callback(done)
+    if output_errors:
+        raise output_errors[0]
+
+def read_photos(values: List[str], stream=None) -> Iterator:
+    """Yield Photo objects for NDJSON lines and plain id strings for the rest"""
+    lines = values if values else (stream or sys.stdin)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            yield Photo(json.loads(line))
+        else:
+            yield line
+
+def _photo(client: Unsplash, item) -> Photo:
+    return item if isinstance(item, Photo) else client.get_photo(item)
+
+def _track(client: Unsplash, photo: Photo) -> None:
+    if not photo.download_location:
+        raise UnsplashError("Download location not available for this photo")
+    client._request("GET", photo.download_location, use_absolute_url=True, hedge=False)
+
+def search_export(client: Unsplash, args) -> Tuple[Callable, Iterable]:
+    def job(page):
+        photos = client.search_photos(args.query, page=page, per_page=args.per_page)
+        return [photo._raw for photo in photos]
+    return job, range(1, args.pages + 1)
+
+def fetch_ids(client: Unsplash, args) -> Tuple[Callable, Iterable]:
+    def job(item):
+        photo_id = item.id if isinstance(item, Photo) else item
+        return client.get_photo(photo_id)._raw
+    return job, read_photos(args.ids)
+
+# Extensions for the image types the CDN serves
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+    "image/gif": ".gif",
+}
+
+def _extension(url: str, headers) -> str:
+    """File extension from the Content-Type header, else the URL's fm parameter"""
+    content_type = headers.get("Content-Type") or ""
+    extension = _EXTENSIONS.get(content_type.split(";")[0].strip().lower())
+    if extension:
+        return extension
+    fm = parse_qs(urlparse(url).query).get("fm")
+    return f".{fm[0]}" if fm else ""
+
+def download(client: Unsplash, args) -> Tuple[Callable, Iterable]:
+    os.makedirs(args.output, exist_ok=True)
+
+    def job(item):
+        photo = _photo(client, item)
+        url = photo.urls.get(args.variant)
+        if not url:
+            raise UnsplashError(f"Photo {photo.id} has no '{args.variant}' URL")
+        response = client.transport.request("GET", url)
+        if not response.ok:
+            raise UnsplashError(f"Image download failed: {response.status_code}")
+        extension = _extension(url, response.headers)
+        path = os.path.join(args.output, f"{photo.id}-{args.variant}{extension}")
+        with open(path, "wb") as image:
+            image.write(response.content)
+        _track(client, photo)
+        return {"id": photo.id, "path": path, "bytes": len(response.content)}
+    return job, read_photos(args.ids)
+
+def track(client: Unsplash, args) -> Tuple[Callable, Iterable]:
+    def job(item):
+        photo = _photo(client, item)
+        _track(client, photo)
+        return {"id": photo.id, "tracked": True}
+    return job, read_photos(args.ids)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="notunsplash", description="Bulk Unsplash API operations")
+    parser.add_argument("--access-key", default=os.getenv("UNSPLASH_ACCESS_KEY"),
+                        help="API access key (default: $UNSPLASH_ACCESS_KEY)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests (default: 8)")
+    parser.add_argument("--max-rate", type=float, default=None,
+                        help="maximum jobs started per second (default: unlimited)")
+    parser.add_argument("--reserve", type=int, default=0,
+                        help="stop when this many API requests are left in the rate-limit window")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search-export", help="export search results as NDJSON")
+    search.add_argument("query")
+    search.add_argument("--pages", type=int, default=1)
+    search.add_argument("--per-page", type=int, default=30)
+    search.set_defaults(handler=search_export)
+
+    fetch = commands.add_parser("fetch-ids", help="fetch full photo metadata by id")
+    fetch.add_argument("ids", nargs="*", help="photo ids (default: read from stdin)")
+    fetch.set_defaults(handler=fetch_ids)
+
+    images = commands.add_parser("download", help="download images and track the downloads")
+    images.add_argument("ids", nargs="*", help="photo ids or NDJSON photos (default: stdin)")
+    images.add_argument("--variant", default="regular",
+                        choices=["raw", "full", "regular", "small", "thumb"])
+    images.add_argument("--output", default=".", help="directory for the images")
+    images.set_defaults(handler=download)
+
+    usage = commands.add_parser("track", help="track downloads for photos used elsewhere")
+    usage.add_argument("ids", nargs="*", help="photo ids or NDJSON photos (default: stdin)")
+    usage.set_defaults(handler=track)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.access_key:
+        sys.stderr.write("An access key is required: pass --access-key or set UNSPLASH_ACCESS_KEY\n")
+        return 2
+
+    client = Unsplash(access_key=args.access_key,
+                      transport=RequestsTransport(pool_maxsize=args.workers))
+    try:
+        job, items = args.handler(client, args)
+        with Reporter() as reporter:
+            run_jobs(job, items, args.workers, RateLimiter(args.max_rate), reporter, client, args.reserve)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); keep the exit-time flush quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as e:
+        sys.stderr.write(f"Cannot write output: {e}\n")
+        return 1
+    finally:
+        client.close()
+    return 1 if reporter.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
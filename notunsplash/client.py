@@ -1,8 +1,39 @@
 """Unsplash API client"""
-from typing import Dict, List, Optional
-import requests
-from .models import Photo, Collection, Topic
-from .errors import UnsplashError, UnsplashAuthError
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Iterable, Iterator, List, Optional
+from .models import Photo, Collection, Topic, User, Statistics, UserIdentityMap
+from .errors import UnsplashError, UnsplashAuthError, UnsplashTimeoutError, UnsplashBatchError
+from .transport import Transport, RequestsTransport
+from .cache import QueryCache
+from .writes import WriteBehindQueue
+from .hedging import HedgePolicy, _spawn
+
+def _expiry(deadline: Optional[float]) -> Optional[float]:
+    """Turn a deadline in seconds from now into a monotonic expiry time"""
+    return None if deadline is None else time.monotonic() + deadline
+
+def _remaining(expires_at: Optional[float]) -> Optional[float]:
+    """Seconds left until an expiry time (None means no deadline)"""
+    return None if expires_at is None else expires_at - time.monotonic()
+
+def _before(call, expires_at: Optional[float], description: str):
+    """Return call(), or raise UnsplashTimeoutError if it is still running at expires_at
+
+    Transports apply their timeout per connect or read, so a slowly
+    trickling response could outlast it; waiting on the call from here
+    bounds the whole request. A call that misses the deadline is left to
+    finish in the background.
+    """
+    if expires_at is None:
+        return call()
+    if _remaining(expires_at) <= 0:
+        raise UnsplashTimeoutError(f"Deadline exceeded: {description}")
+    try:
+        return _spawn(call).result(timeout=max(0.0, _remaining(expires_at)))
+    except FutureTimeoutError:
+        raise UnsplashTimeoutError(f"Deadline exceeded: {description}") from None
 
 class Unsplash:
     """Client for the Unsplash API"""
@@ -12,9 +43,36 @@ class Unsplash:
         access_key: str, 
         api_base_url: str = "https://api.unsplash.com",
         oauth_base_url: str = "https://unsplash.com/oauth",
-        secret_key: Optional[str] = None
+        secret_key: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        cache: Optional[QueryCache] = None,
+        write_queue: Optional[WriteBehindQueue] = None,
+        hedging: Optional[HedgePolicy] = None
     ):
-        """Initialize the client"""
+        """Initialize the client
+        
+        Args:
+            access_key: Unsplash application access key
+            api_base_url: Base URL of the API
+            oauth_base_url: Base URL of the OAuth endpoints
+            secret_key: Application secret key, required for OAuth
+            transport: HTTP transport to use. Defaults to a pooled
+                RequestsTransport; pass HTTP2Transport() to multiplex
+                concurrent requests over one HTTP/2 connection
+            cache: Optional QueryCache for search results. Call
+                cache.start() to keep popular queries warm in the background
+            write_queue: Optional WriteBehindQueue. When set, like_photo and
+                unlike_photo return immediately and the requests are
+                coalesced and sent in the background
+            hedging: Optional HedgePolicy. When set, slow GET requests are
+                backed up by a second request and the first answer wins.
+                Download tracking is never hedged
+        
+        Every method that calls the API accepts ``deadline``: the number of
+        seconds the whole call may take, including pagination, batch
+        fan-out and hedged requests. UnsplashTimeoutError is raised once
+        it passes.
+        """
         if not access_key:
             raise UnsplashAuthError("Access key is required")
             
@@ -23,37 +81,104 @@ class Unsplash:
         self.api_base_url = api_base_url
         self.oauth_base_url = oauth_base_url
         
-        # Initialize session with default headers
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Users are interned by id so repeated photographers share one object
+        self.users = UserIdentityMap()
+        
+        self.transport = transport or RequestsTransport()
+        self.cache = cache
+        self.write_queue = write_queue
+        self.hedging = hedging
+        if write_queue is not None:
+            write_queue.start(self._send_like)
+        
+        # Rate limit reported by the most recent response
+        self.rate_limit: Optional[int] = None
+        self.rate_limit_remaining: Optional[int] = None
+        
+        # Default headers sent with every request
+        self.headers = {
             "Accept-Version": "v1",
             "Authorization": f"Client-ID {access_key}"
-        })
+        }
+
+    @property
+    def session(self):
+        """The requests.Session used by a RequestsTransport
+
+        Kept for code that configures the session directly (adapters,
+        proxies, extra headers). The API headers are in ``self.headers`` and
+        take precedence over session headers. Other transports have no
+        session.
+        """
+        if not isinstance(self.transport, RequestsTransport):
+            raise AttributeError(f"{type(self.transport).__name__} has no requests session")
+        return self.transport.session
 
-    def _request(self, method: str, endpoint: str, use_absolute_url: bool = False, **kwargs) -> Dict:
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        use_absolute_url: bool = False,
+        expires_at: Optional[float] = None,
+        hedge: bool = True,
+        **kwargs
+    ) -> Dict:
         """Make a request to the Unsplash API
         
         Args:
             method: HTTP method to use
             endpoint: API endpoint or full URL if use_absolute_url is True
             use_absolute_url: If True, use endpoint as the full URL instead of joining with base URL
-            **kwargs: Additional arguments to pass to requests
+            expires_at: time.monotonic() value after which the call fails
+            hedge: Allow a hedged duplicate of a GET request. Pass False for
+                GETs with side effects, such as download tracking
+            **kwargs: Additional arguments to pass to the transport; headers
+                are merged over the client's default headers
         """
         url = endpoint if use_absolute_url else f"{self.api_base_url}/{endpoint.lstrip('/')}"
+        kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
+        
+        def send():
+            timeout = _remaining(expires_at)
+            if timeout is not None and timeout <= 0:
+                raise UnsplashTimeoutError(f"Deadline exceeded: {method} {url}")
+            return self.transport.request(method, url, timeout=timeout, **kwargs)
         
-        # Headers are already set in the session
-        response = self.session.request(method, url, **kwargs)
+        def call():
+            if hedge and method == "GET" and self.hedging is not None:
+                return self.hedging.call(send)
+            return send()
+        
+        response = _before(call, expires_at, f"{method} {url}")
+        self._update_rate_limit(response.headers)
         
         if response.status_code == 401:
-            raise UnsplashAuthError("OAuth error: The access token is invalid")
+            raise UnsplashAuthError("OAuth error: The access token is invalid", status_code=401)
         elif response.status_code == 403:
-            raise UnsplashAuthError("Authentication required for this endpoint")
+            raise UnsplashAuthError("Authentication required for this endpoint", status_code=403)
         elif not response.ok:
-            error_msg = response.json().get('errors', [response.text])[0]
-            raise UnsplashError(f"API request failed: {response.status_code} - {error_msg}")
+            try:
+                error_msg = response.json().get('errors', [response.text])[0]
+            except (ValueError, AttributeError):
+                error_msg = response.text  # e.g. an HTML error page from a proxy
+            raise UnsplashError(
+                f"API request failed: {response.status_code} - {error_msg}",
+                status_code=response.status_code
+            )
             
         return response.json() if response.content else {}
 
+    def _update_rate_limit(self, headers) -> None:
+        """Record the rate limit headers of a response"""
+        limit = headers.get("X-Ratelimit-Limit")
+        remaining = headers.get("X-Ratelimit-Remaining")
+        if limit is not None and str(limit).isdigit():
+            self.rate_limit = int(limit)
+            if self.cache is not None:
+                self.cache.hourly_limit = self.rate_limit
+        if remaining is not None and str(remaining).isdigit():
+            self.rate_limit_remaining = int(remaining)
+
     def get_oauth_url(
         self,
         redirect_uri: str,
@@ -74,7 +199,7 @@ class Unsplash:
         query = "&".join(f"{k}={v}" for k, v in params.items())
         return f"{self.oauth_base_url}/authorize?{query}"
 
-    def get_oauth_token(self, code: str, redirect_uri: str) -> Dict:
+    def get_oauth_token(self, code: str, redirect_uri: str, deadline: Optional[float] = None) -> Dict:
         """Exchange authorization code for access token"""
         if not self.secret_key:
             raise UnsplashAuthError("Secret key is required for OAuth token exchange")
@@ -87,10 +212,14 @@ class Unsplash:
             "grant_type": "authorization_code"
         }
 
-        response = self.session.post(
-            f"{self.oauth_base_url}/token",
-            data=data
-        )
+        url = f"{self.oauth_base_url}/token"
+
+        def send():
+            return self.transport.request(
+                "POST", url, headers=self.headers, data=data, timeout=deadline
+            )
+        
+        response = _before(send, _expiry(deadline), f"POST {url}")
 
         if response.status_code != 200:
             try:
@@ -103,40 +232,222 @@ class Unsplash:
 
     def set_oauth_token(self, access_token: str) -> None:
         """Set OAuth access token for authenticated requests"""
-        self.session.headers.update({
+        self.headers.update({
             "Authorization": f"Bearer {access_token}"
         })
 
-    def search_photos(self, query: str, page: int = 1, per_page: int = 10) -> List[Photo]:
+    def close(self) -> None:
+        """Close the underlying transport and its pooled connections
+        
+        Pending writes in the write queue are sent first. The cache is
+        left open, since other clients may share it; close it separately.
+        """
+        if self.write_queue is not None:
+            self.write_queue.close()
+        self.transport.close()
+
+    def search_photos(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 10,
+        deadline: Optional[float] = None
+    ) -> List[Photo]:
         """Search for photos"""
         params = {"query": query, "page": page, "per_page": per_page}
-        data = self._request("GET", "/search/photos", params=params)
-        return [Photo(result) for result in data.get("results", [])]
+        authorization = {"Authorization": self.headers["Authorization"]}
+        expires_at = _expiry(deadline)
+        
+        def fetch(expires_at=None):
+            data = self._request(
+                "GET", "/search/photos", params=params, expires_at=expires_at, headers=authorization
+            )
+            return [Photo(result, self.users) for result in data.get("results", [])]
+        
+        if self.cache is None:
+            return fetch(expires_at)
+        # Results can depend on the token, so clients with different tokens
+        # sharing a cache get separate entries, each refreshed with its own token
+        token = hashlib.sha256(authorization["Authorization"].encode()).hexdigest()[:16]
+        key = ("search_photos", token, query, page, per_page)
+        return list(self.cache.get(key, fetch, load=lambda: fetch(expires_at)))
 
-    def get_photo(self, photo_id: str) -> Photo:
+    def get_photo(self, photo_id: str, deadline: Optional[float] = None) -> Photo:
         """Get a single photo"""
-        data = self._request("GET", f"/photos/{photo_id}")
-        return Photo(data)
+        data = self._request("GET", f"/photos/{photo_id}", expires_at=_expiry(deadline))
+        return Photo(data, self.users)
+
+    def get_photo_statistics(
+        self,
+        photo_id: str,
+        resolution: str = "days",
+        quantity: int = 30,
+        deadline: Optional[float] = None
+    ) -> Statistics:
+        """Get download, view and like statistics for a photo"""
+        params = {"resolution": resolution, "quantity": quantity}
+        data = self._request(
+            "GET", f"/photos/{photo_id}/statistics", params=params, expires_at=_expiry(deadline)
+        )
+        return Statistics(data)
+
+    def get_user(self, username: str, deadline: Optional[float] = None) -> User:
+        """Get a user's public profile"""
+        data = self._request("GET", f"/users/{username}", expires_at=_expiry(deadline))
+        return self.users.refresh(data)
+
+    def get_users(
+        self,
+        usernames: Iterable[str],
+        max_workers: int = 8,
+        deadline: Optional[float] = None
+    ) -> Dict[str, User]:
+        """Get several user profiles concurrently
+        
+        Duplicate usernames are fetched once. Requests run on a thread pool
+        sharing the client's transport, and a failing username does not
+        stop the others.
+        
+        Args:
+            usernames: Usernames to fetch
+            max_workers: Maximum number of requests in flight
+            
+        Returns:
+            Dict mapping each distinct username to its User, in input order
+            
+        Raises:
+            UnsplashBatchError: If any username failed, once all have
+                finished. Its ``results`` hold the users that were fetched
+                and its ``errors`` the exception for each failed username
+        """
+        expires_at = _expiry(deadline)
+        
+        def fetch(username):
+            return self.get_user(username, deadline=_remaining(expires_at))
+        
+        return self._fan_out(fetch, usernames, max_workers)
+
+    def iter_user_photos(
+        self,
+        username: str,
+        per_page: int = 30,
+        order_by: str = "latest",
+        max_pages: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> Iterator[Photo]:
+        """Iterate over a user's photos, fetching pages as they are consumed
+        
+        Args:
+            username: User whose photos to list
+            per_page: Photos per request (the API allows up to 30)
+            order_by: "latest", "oldest", "popular", "views" or "downloads"
+            max_pages: Stop after this many pages
+            deadline: Seconds allowed for fetching all pages, counted from
+                the first page request
+        """
+        expires_at = _expiry(deadline)
+        page = 1
+        while max_pages is None or page <= max_pages:
+            params = {"page": page, "per_page": per_page, "order_by": order_by}
+            results = self._request(
+                "GET", f"/users/{username}/photos", params=params, expires_at=expires_at
+            )
+            for result in results:
+                yield Photo(result, self.users)
+            if len(results) < per_page:
+                return
+            page += 1
+
+    def get_user_statistics(
+        self,
+        username: str,
+        resolution: str = "days",
+        quantity: int = 30,
+        deadline: Optional[float] = None
+    ) -> Statistics:
+        """Get download, view and like statistics for a user"""
+        params = {"resolution": resolution, "quantity": quantity}
+        data = self._request(
+            "GET", f"/users/{username}/statistics", params=params, expires_at=_expiry(deadline)
+        )
+        return Statistics(data)
+
+    def get_users_statistics(
+        self,
+        usernames: Iterable[str],
+        resolution: str = "days",
+        quantity: int = 30,
+        max_workers: int = 8,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Statistics]:
+        """Get statistics for several users concurrently (see get_users)"""
+        expires_at = _expiry(deadline)
+        
+        def fetch(username):
+            return self.get_user_statistics(
+                username, resolution, quantity, deadline=_remaining(expires_at)
+            )
+        
+        return self._fan_out(fetch, usernames, max_workers)
+
+    def _fan_out(self, fetch, keys: Iterable[str], max_workers: int) -> Dict:
+        """Call fetch once per distinct key on a thread pool, preserving order
+        
+        Raises UnsplashBatchError after every key has finished if any failed.
+        """
+        unique = list(dict.fromkeys(keys))
+        if not unique:
+            return {}
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            futures = [(key, executor.submit(fetch, key)) for key in unique]
+            for key, future in futures:
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = e
+        if errors:
+            raise UnsplashBatchError(results, errors)
+        return results
 
-    def like_photo(self, photo_id: str) -> None:
+    def like_photo(self, photo_id: str, deadline: Optional[float] = None) -> None:
         """Like a photo (requires authentication)"""
+        if self.write_queue is not None:
+            self._queue_like(photo_id, True)
+            return
         try:
-            self._request("POST", f"/photos/{photo_id}/like")
+            self._request("POST", f"/photos/{photo_id}/like", expires_at=_expiry(deadline))
         except UnsplashError as e:
             if "OAuth" in str(e):
                 raise UnsplashAuthError("Authentication required to like photos")
             raise
 
-    def unlike_photo(self, photo_id: str) -> None:
+    def unlike_photo(self, photo_id: str, deadline: Optional[float] = None) -> None:
         """Unlike a photo (requires authentication)"""
+        if self.write_queue is not None:
+            self._queue_like(photo_id, False)
+            return
         try:
-            self._request("DELETE", f"/photos/{photo_id}/like")
+            self._request("DELETE", f"/photos/{photo_id}/like", expires_at=_expiry(deadline))
         except UnsplashError as e:
             if "OAuth" in str(e):
                 raise UnsplashAuthError("Authentication required to unlike photos")
             raise
 
-    def download_photo(self, photo_id: str) -> Dict:
+    def _queue_like(self, photo_id: str, like: bool) -> None:
+        """Hand a like/unlike intent to the write queue"""
+        authorization = self.headers["Authorization"]
+        if not authorization.startswith("Bearer "):
+            action = "like" if like else "unlike"
+            raise UnsplashAuthError(f"Authentication required to {action} photos")
+        self.write_queue.put(authorization, photo_id, like)
+
+    def _send_like(self, authorization: str, photo_id: str, like: bool) -> None:
+        """Send a queued like/unlike with the token it was made under"""
+        method = "POST" if like else "DELETE"
+        self._request(method, f"/photos/{photo_id}/like", headers={"Authorization": authorization})
+
+    def download_photo(self, photo_id: str, deadline: Optional[float] = None) -> Dict:
         """Track a photo download by triggering the download endpoint.
         
         This should be called whenever a user performs an action similar to downloading,
@@ -148,6 +459,7 @@ class Unsplash:
         
         Args:
             photo_id: The ID of the photo being downloaded/used
+            deadline: Seconds allowed for both the photo lookup and the tracking call
             
         Returns:
             Dict containing the download tracking response
@@ -156,9 +468,13 @@ class Unsplash:
             This is an event endpoint used to increment download counts.
             It should NOT be used to get the photo URL for embedding (use photo.urls instead).
         """
-        photo = self.get_photo(photo_id)
+        expires_at = _expiry(deadline)
+        photo = self.get_photo(photo_id, deadline=_remaining(expires_at))
         if not photo.download_location:
             raise UnsplashError("Download location not available for this photo")
             
         # The download_location URL already includes necessary parameters
-        return self._request("GET", photo.download_location, use_absolute_url=True)
+        # Not hedged: a duplicate request would count the download twice
+        return self._request(
+            "GET", photo.download_location, use_absolute_url=True, expires_at=expires_at, hedge=False
+        )
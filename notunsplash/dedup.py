@@ -0,0 +1,186 @@
+"""Perceptual-hash de-duplication of near-identical photos
+
+Photos are hashed from their small ``urls['thumb']`` images: each thumbnail
+is decoded to a tiny grayscale grid, and the grids of a whole batch are
+hashed at once with NumPy. Two photos whose 64-bit hashes differ in at most
+``threshold`` bits are treated as duplicates.
+
+Requires NumPy and Pillow (``pip install notunsplash[analytics,images]``).
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from .errors import UnsplashError
+from .frame import _require_numpy, np
+from .models import Photo
+from .transport import Transport, RequestsTransport
+
+# Grid sizes fed to each hash
+_GRID = {"dhash": (9, 8), "phash": (32, 32)}
+
+def _dct_matrix(size: int) -> "np.ndarray":
+    """Orthonormal DCT-II matrix"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+def _pack(bits: "np.ndarray") -> "np.ndarray":
+    """Pack an (n, 64) boolean array into n uint64 hashes"""
+    return np.packbits(bits, axis=1).view(">u8").astype(np.uint64).ravel()
+
+def dhash(grids: "np.ndarray") -> "np.ndarray":
+    """Difference hashes for an (n, 8, 9) stack of grayscale grids"""
+    bits = grids[:, :, 1:] > grids[:, :, :-1]
+    return _pack(bits.reshape(len(grids), 64))
+
+def phash(grids: "np.ndarray") -> "np.ndarray":
+    """DCT-based perceptual hashes for an (n, 32, 32) stack of grayscale grids"""
+    dct = _dct_matrix(grids.shape[1])
+    low = (dct @ grids @ dct.T)[:, :8, :8].reshape(len(grids), 64)
+    median = np.median(low[:, 1:], axis=1, keepdims=True)  # skip the DC term
+    return _pack(low > median)
+
+def popcount(values: "np.ndarray") -> "np.ndarray":
+    """Number of set bits in each uint64"""
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(values)
+    table = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+    return table[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+def hamming(hashes: "np.ndarray", value: int) -> "np.ndarray":
+    """Hamming distance from each hash to value"""
+    return popcount(hashes ^ np.uint64(value))
+
+def _require_pillow() -> None:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise UnsplashError("Perceptual hashing requires Pillow: pip install notunsplash[images]")
+
+def _grid(data: bytes, size) -> "np.ndarray":
+    """Decode an image into a small float32 grayscale grid"""
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as image:
+        small = image.convert("L").resize(size, Image.LANCZOS)
+    return np.asarray(small, dtype=np.float32)
+
+class Deduplicator:
+    """Streaming filter that drops photos nearly identical to earlier ones
+
+    Hashes are cached by photo id, so a photo's thumbnail is downloaded and
+    hashed at most once. The set of photos already let through is kept as a
+    NumPy array of hashes and compared against in one vectorized pass per
+    photo.
+    """
+    def __init__(
+        self,
+        method: str = "dhash",
+        threshold: int = 10,
+        fetch: Optional[Callable[[Photo], bytes]] = None,
+        transport: Optional[Transport] = None,
+        workers: int = 8
+    ):
+        """Initialize the filter
+
+        Args:
+            method: "dhash" (fast, robust to resizing) or "phash" (more
+                robust to brightness and compression changes)
+            threshold: Maximum differing bits for two photos to count as
+                duplicates
+            fetch: Function returning the thumbnail bytes for a photo, e.g.
+                to read from an ImageCache. Defaults to downloading
+                ``photo.urls['thumb']`` through the transport
+            transport: Transport used by the default fetch
+            workers: Thumbnails downloaded and decoded concurrently
+        """
+        _require_numpy()
+        _require_pillow()
+        if method not in _GRID:
+            raise ValueError(f"Unknown hash method: {method}")
+        self.method = method
+        self.threshold = threshold
+        self.transport = transport or RequestsTransport()
+        self.fetch = fetch or self._download_thumb
+        self.workers = workers
+        self.hashes: Dict[str, int] = {}
+
+        self._kept = np.empty(1024, dtype=np.uint64)
+        self._kept_count = 0
+
+    def hash_photos(self, photos: Iterable[Photo]) -> Dict[str, int]:
+        """Hash photos that are not cached yet and return their hashes
+
+        Photos whose thumbnail cannot be fetched or decoded are left out.
+        """
+        photos = list(photos)
+        missing = list({photo.id: photo for photo in photos if photo.id not in self.hashes}.values())
+        if missing:
+            size = _GRID[self.method]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                grids = list(executor.map(lambda photo: self._try_grid(photo, size), missing))
+            decoded = [(photo, grid) for photo, grid in zip(missing, grids) if grid is not None]
+            if decoded:
+                stack = np.stack([grid for _, grid in decoded])
+                values = dhash(stack) if self.method == "dhash" else phash(stack)
+                for (photo, _), value in zip(decoded, values):
+                    self.hashes[photo.id] = int(value)
+        return {photo.id: self.hashes[photo.id] for photo in photos if photo.id in self.hashes}
+
+    def filter(self, photos: Iterable[Photo], batch_size: int = 64) -> Iterator[Photo]:
+        """Yield photos that are not near-duplicates of any photo yielded before
+
+        Photos are hashed in batches of batch_size; photos that could not
+        be hashed are passed through.
+        """
+        batch: List[Photo] = []
+        for photo in photos:
+            batch.append(photo)
+            if len(batch) >= batch_size:
+                yield from self._filter_batch(batch)
+                batch = []
+        if batch:
+            yield from self._filter_batch(batch)
+
+    def is_duplicate(self, value: int) -> bool:
+        """Whether a hash is within threshold of a photo already let through"""
+        if not self._kept_count:
+            return False
+        distances = hamming(self._kept[:self._kept_count], value)
+        return bool(distances.min() <= self.threshold)
+
+    def reset(self) -> None:
+        """Forget which photos were let through (cached hashes are kept)"""
+        self._kept_count = 0
+
+    def _filter_batch(self, batch: List[Photo]) -> Iterator[Photo]:
+        hashes = self.hash_photos(batch)
+        for photo in batch:
+            value = hashes.get(photo.id)
+            if value is None:
+                yield photo
+            elif not self.is_duplicate(value):
+                self._keep(value)
+                yield photo
+
+    def _keep(self, value: int) -> None:
+        if self._kept_count == len(self._kept):
+            self._kept = np.concatenate([self._kept, np.empty_like(self._kept)])
+        self._kept[self._kept_count] = value
+        self._kept_count += 1
+
+    def _try_grid(self, photo: Photo, size) -> Optional["np.ndarray"]:
+        try:
+            return _grid(self.fetch(photo), size)
+        except (UnsplashError, OSError, ValueError):
+            return None
+
+    def _download_thumb(self, photo: Photo) -> bytes:
+        url = photo.urls.get("thumb")
+        if not url:
+            raise UnsplashError(f"Photo {photo.id} has no 'thumb' URL")
+        response = self.transport.request("GET", url)
+        if not response.ok:
+            raise UnsplashError(f"Thumbnail download failed: {response.status_code} - {url}")
+        return response.content
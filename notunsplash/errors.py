@@ -3,9 +3,38 @@ Custom exceptions for the Unsplash SDK
 """
 
 class UnsplashError(Exception):
-    """Base exception for Unsplash API errors"""
-    pass
+    """Base exception for Unsplash API errors
+
+    Attributes:
+        status_code: HTTP status of the failed response, if there was one
+    """
+    def __init__(self, message: str = "", status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
 
 class UnsplashAuthError(UnsplashError):
     """Exception raised for authentication-related errors"""
     pass
+
+class UnsplashTimeoutError(UnsplashError):
+    """Exception raised when a call does not finish within its deadline"""
+    pass
+
+class UnsplashConnectionError(UnsplashError):
+    """Exception raised when a request fails before a response arrives
+    (connection refused or reset, DNS failure, broken stream)"""
+    pass
+
+class UnsplashBatchError(UnsplashError):
+    """Exception raised when some requests of a batch call fail
+
+    Attributes:
+        results: Values fetched successfully, keyed like the batch result
+        errors: Exception raised for each key that failed
+    """
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        failed = ", ".join(repr(key) for key in list(errors)[:5])
+        more = f" and {len(errors) - 5} more" if len(errors) > 5 else ""
+        super().__init__(f"{len(errors)} of {len(results) + len(errors)} requests failed: {failed}{more}")
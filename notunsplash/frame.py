@@ -0,0 +1,156 @@
+"""Columnar export of photo metadata for analytics
+
+Requires NumPy (``pip install notunsplash[analytics]``). pandas and pyarrow
+are only needed for the matching export methods.
+"""
+import re
+from datetime import timezone
+from typing import Dict, Iterable, Optional, Sequence, Union
+from .errors import UnsplashError
+from .models import Photo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+NUMERIC_COLUMNS = ("width", "height", "likes", "downloads")
+
+# Photo colors as the API sends them
+_HEX_COLOR = re.compile(r"#[0-9a-fA-F]{6}")
+
+def _require_numpy() -> None:
+    if np is None:
+        raise UnsplashError("PhotoFrame requires NumPy: pip install notunsplash[analytics]")
+
+def _to_utc(value):
+    """Convert an aware datetime to naive UTC for datetime64 storage"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _parse_colors(colors: Sequence[Optional[str]]) -> "np.ndarray":
+    """Parse '#rrggbb' strings into an (n, 3) uint8 RGB array (black if missing or malformed)"""
+    packed = np.fromiter(
+        (int(c[1:], 16) if isinstance(c, str) and _HEX_COLOR.fullmatch(c) else 0 for c in colors),
+        dtype=np.uint32,
+        count=len(colors)
+    )
+    rgb = np.empty((len(colors), 3), dtype=np.uint8)
+    rgb[:, 0] = packed >> 16
+    rgb[:, 1] = (packed >> 8) & 0xFF
+    rgb[:, 2] = packed & 0xFF
+    return rgb
+
+class PhotoFrame:
+    """Struct-of-arrays view over photo metadata
+
+    Each column is a NumPy array of the same length. Numeric columns are
+    ``int64`` (missing values become 0), ``created_at`` is ``datetime64[us]``
+    in UTC (missing values are NaT), ``color_rgb`` is an ``(n, 3)`` uint8 array
+    (black for missing or malformed colors) and string columns are object
+    arrays.
+    """
+    def __init__(self, columns: Dict[str, "np.ndarray"]):
+        _require_numpy()
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All PhotoFrame columns must have the same length")
+        self.columns = columns
+
+    @classmethod
+    def from_photos(cls, photos: Iterable[Photo], raw_fields: Sequence[str] = ()) -> "PhotoFrame":
+        """Build a frame from Photo objects
+
+        Args:
+            photos: Photos to export
+            raw_fields: Extra top-level keys read from each photo's ``_raw``
+                payload and stored as object columns
+        """
+        _require_numpy()
+        photos = list(photos)
+        count = len(photos)
+        columns = {}
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.fromiter(
+                (getattr(photo, name) or 0 for photo in photos), dtype=np.int64, count=count
+            )
+        columns["created_at"] = np.array(
+            [_to_utc(photo.created_at) for photo in photos], dtype="datetime64[us]"
+        )
+        columns["id"] = np.array([photo.id for photo in photos], dtype=object)
+        columns["color"] = np.array([photo.color for photo in photos], dtype=object)
+        columns["color_rgb"] = _parse_colors(columns["color"])
+        columns["description"] = np.array([photo.description for photo in photos], dtype=object)
+        columns["alt_description"] = np.array([photo.alt_description for photo in photos], dtype=object)
+        columns["username"] = np.array(
+            [photo.user.username if photo.user else None for photo in photos], dtype=object
+        )
+        columns["html_link"] = np.array([photo.html_link for photo in photos], dtype=object)
+        for field in raw_fields:
+            columns[field] = np.array([photo._raw.get(field) for photo in photos], dtype=object)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, key: Union[str, "np.ndarray", slice]):
+        """Return a column by name, or a new frame for a mask, index array or slice"""
+        if isinstance(key, str):
+            return self.columns[key]
+        return PhotoFrame({name: column[key] for name, column in self.columns.items()})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    @property
+    def aspect_ratio(self) -> "np.ndarray":
+        """Width divided by height (NaN where the height is unknown)"""
+        height = self.columns["height"].astype(np.float64)
+        height[height == 0] = np.nan
+        return self.columns["width"] / height
+
+    def filter(self, mask: "np.ndarray") -> "PhotoFrame":
+        """Return the rows where the boolean mask is True"""
+        return self[np.asarray(mask, dtype=bool)]
+
+    def sort_by(self, column: str, descending: bool = False) -> "PhotoFrame":
+        """Return a new frame sorted by a column (stable)"""
+        order = np.argsort(self.columns[column], kind="stable")
+        if descending:
+            order = order[::-1]
+        return self[order]
+
+    def _flat_columns(self) -> Dict[str, "np.ndarray"]:
+        """Columns with color_rgb split into one array per channel"""
+        flat = {}
+        for name, column in self.columns.items():
+            if name == "color_rgb":
+                for index, channel in enumerate(("color_r", "color_g", "color_b")):
+                    flat[channel] = column[:, index]
+            else:
+                flat[name] = column
+        return flat
+
+    def to_pandas(self):
+        """Export to a pandas DataFrame without copying numeric columns"""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise UnsplashError("to_pandas requires pandas: pip install pandas")
+        return pd.DataFrame(self._flat_columns(), copy=False)
+
+    def to_arrow(self):
+        """Export to a pyarrow Table (numeric columns are zero-copy where possible)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise UnsplashError("to_arrow requires pyarrow: pip install pyarrow")
+        flat = self._flat_columns()
+        arrays = [
+            pa.array(column.tolist() if column.dtype == object else np.ascontiguousarray(column))
+            for column in flat.values()
+        ]
+        return pa.Table.from_arrays(arrays, names=list(flat))
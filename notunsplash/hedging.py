@@ -0,0 +1,120 @@
+"""Hedged requests for tail-latency control"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Optional, TypeVar
+from .utils import percentile
+
+T = TypeVar("T")
+
+def _spawn(call: Callable[[], T]) -> "Future[T]":
+    """Run call on a new daemon thread and return a future for its result
+
+    A thread per request, rather than a shared pool, means a request never
+    waits behind others before it is sent, and concurrency stays whatever
+    the caller chose.
+    """
+    future: "Future[T]" = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name="notunsplash-request", daemon=True).start()
+    return future
+
+class HedgePolicy:
+    """Sends a backup request when the first one is slower than usual
+
+    The hedge delay is the configured percentile of recently observed
+    latencies: if the first request has not answered by then, an identical
+    second request is sent and whichever answers first is used. Hedges are
+    capped at ``budget`` (a fraction of all requests) so a slow upstream does
+    not double the load. Only idempotent GET requests are hedged.
+    """
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 0.01,
+        min_samples: int = 20,
+        window: int = 500
+    ):
+        """Initialize the policy
+
+        Args:
+            percentile: Latency percentile used as the hedge delay
+            budget: Maximum fraction of requests that may be hedged
+            min_delay: Lower bound for the hedge delay in seconds
+            min_samples: Latencies needed before hedging starts
+            window: Number of recent latencies kept
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "over_budget": 0}
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def delay(self) -> Optional[float]:
+        """Current hedge delay, or None while too few latencies are known"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            samples = list(self._latencies)
+        return max(self.min_delay, percentile(samples, self.percentile))
+
+    def call(self, send: Callable[[], T]) -> T:
+        """Run send(), hedging it with a second call if it is slow
+
+        While too few latencies are known, send() simply runs on the
+        calling thread. Otherwise each attempt gets its own thread, so the
+        hedge delay is measured from the moment the request is sent.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+        delay = self.delay()
+        if delay is None:
+            return self._timed(send)
+
+        primary = _spawn(lambda: self._timed(send))
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget * self.stats["requests"]:
+                self.stats["over_budget"] += 1
+                hedge = None
+            else:
+                self.stats["hedged"] += 1
+                hedge = _spawn(lambda: self._timed(send))
+        if hedge is None:
+            return primary.result()
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded:
+                winner = primary if primary in succeeded else hedge
+                if winner is hedge:
+                    with self._lock:
+                        self.stats["hedge_wins"] += 1
+                return winner.result()
+        return primary.result()  # both failed; raise the first request's error
+
+    def _timed(self, send: Callable[[], T]) -> T:
+        """Run send, recording its latency when it succeeds"""
+        started = time.perf_counter()
+        result = send()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+        return result
@@ -0,0 +1,382 @@
+"""Local on-disk cache for photo images and derivatives
+
+Blobs are stored under a path derived from the SHA-256 of the photo id and
+variant, so every worker and process sharing the directory finds the same
+file. Writes go to a temporary file that is atomically renamed into place,
+and a per-blob lock file makes concurrent processes wait for a download or
+render in progress instead of repeating it.
+
+Generating derivatives requires Pillow (``pip install notunsplash[images]``).
+
+Note that Unsplash requires hotlinking ``photo.urls`` when displaying photos
+to end users; this cache is meant for local processing pipelines.
+"""
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+from .errors import UnsplashError
+from .models import Photo
+from .transport import Transport, RequestsTransport
+
+class Derivative:
+    """Recipe for an image derived locally from a downloaded variant"""
+    def __init__(
+        self,
+        width: int,
+        height: Optional[int] = None,
+        crop: bool = False,
+        format: str = "JPEG",
+        quality: int = 85,
+        source: str = "full"
+    ):
+        """Initialize the recipe
+
+        Args:
+            width: Target width in pixels
+            height: Target height in pixels. If omitted the aspect ratio
+                of the source is kept
+            crop: Crop to exactly width x height instead of fitting inside it
+            format: Output format understood by Pillow (JPEG, WEBP, PNG, ...)
+            quality: Encoder quality for lossy formats
+            source: URL variant the derivative is generated from
+        """
+        if crop and not height:
+            raise ValueError("Cropping requires both width and height")
+        self.width = width
+        self.height = height
+        self.crop = crop
+        self.format = format.upper()
+        self.quality = quality
+        self.source = source
+
+    @property
+    def name(self) -> str:
+        """Variant name used as the cache key"""
+        mode = "crop" if self.crop else "fit"
+        return f"{self.source}-{self.width}x{self.height or 0}-{mode}-q{self.quality}.{self.format.lower()}"
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to path so readers never observe a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+@contextmanager
+def _blob_lock(path: str, lock_timeout: float):
+    """Cross-process lock on a blob, held while it is downloaded or rendered
+
+    A lock older than lock_timeout seconds is taken over, as its holder
+    is assumed to have died.
+    """
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > lock_timeout:
+                    os.unlink(lock_path)  # holder died; take over
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        try:
+            os.unlink(lock_path)
+        except FileNotFoundError:
+            pass
+
+def _render(source_path: str, target_path: str, derivative: Derivative) -> int:
+    """Resize/crop/encode one image (runs in a worker process)
+
+    Returns:
+        Size of the written derivative in bytes
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise UnsplashError("Generating derivatives requires Pillow: pip install notunsplash[images]")
+
+    with Image.open(source_path) as image:
+        if derivative.crop:
+            image = ImageOps.fit(image, (derivative.width, derivative.height))
+        else:
+            image = image.copy()
+            image.thumbnail((derivative.width, derivative.height or image.height))
+        if derivative.format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format=derivative.format, quality=derivative.quality)
+    data = buffer.getvalue()
+    _atomic_write(target_path, data)
+    return len(data)
+
+def _render_once(
+    source_path: str,
+    target_path: str,
+    derivative: Derivative,
+    lock_timeout: float
+) -> int:
+    """Render a derivative under its blob lock unless it exists (runs in a worker process)
+
+    Returns:
+        Size of the written derivative in bytes, or 0 if another process
+        rendered it first
+    """
+    with _blob_lock(target_path, lock_timeout):
+        if os.path.exists(target_path):
+            return 0
+        return _render(source_path, target_path, derivative)
+
+def _stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """Stat a directory entry, or None if another process removed it"""
+    try:
+        return entry.stat()
+    except FileNotFoundError:
+        return None
+
+class ImageCache:
+    """Size-bounded on-disk cache of photo images shared across processes
+
+    Eviction is least-recently-used by file modification time, which is
+    refreshed on every read, so all processes sharing the directory take part
+    in the same LRU order. Blobs that this cache is currently downloading,
+    rendering from or returning are pinned and never evicted, so the cache
+    can run over ``max_bytes`` while a batch larger than the budget is in
+    progress.
+    """
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 1 << 30,
+        transport: Optional[Transport] = None,
+        workers: Optional[int] = None,
+        lock_timeout: float = 60.0
+    ):
+        """Initialize the cache
+
+        Args:
+            directory: Cache directory, created if missing
+            max_bytes: Size above which least recently used blobs are evicted
+            transport: Transport used to download images from the CDN
+            workers: Number of processes used by derive_many
+            lock_timeout: Seconds after which another process's lock on a
+                blob is considered stale
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.transport = transport or RequestsTransport()
+        self.workers = workers
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._size = self.size()
+
+    def path(self, photo_id: str, variant: str) -> str:
+        """Return the blob path for a photo variant"""
+        digest = hashlib.sha256(f"{photo_id}\0{variant}".encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def contains(self, photo_id: str, variant: str) -> bool:
+        return os.path.exists(self.path(photo_id, variant))
+
+    def get(self, photo_id: str, variant: str) -> Optional[mmap.mmap]:
+        """Return a read-only memory map of a cached blob, or None if missing
+
+        The caller owns the map and should close it (it is a context manager).
+        """
+        path = self.path(photo_id, variant)
+        try:
+            with open(path, "rb") as blob:
+                if not os.fstat(blob.fileno()).st_size:
+                    os.unlink(path)  # an empty blob cannot be mapped; treat it as missing
+                    return None
+                os.utime(path)
+                return mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    def put(self, photo_id: str, variant: str, data: bytes) -> str:
+        """Store a blob atomically and return its path"""
+        if not data:
+            raise ValueError("Cannot cache an empty blob")
+        path = self.path(photo_id, variant)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        _atomic_write(path, data)
+        self._added(len(data) - replaced)
+        return path
+
+    def fetch(self, photo: Photo, variant: str = "regular") -> mmap.mmap:
+        """Return a URL variant of a photo, downloading it on a cache miss"""
+        with self._pinned([self.path(photo.id, variant)]):
+            while True:
+                self._ensure_download(photo, variant)
+                blob = self.get(photo.id, variant)
+                if blob is not None:
+                    return blob
+                # evicted by another process in between; download it again
+
+    def derive(self, photo: Photo, derivative: Derivative) -> mmap.mmap:
+        """Return a derivative of a photo, generating it locally on a cache miss"""
+        source_path = self.path(photo.id, derivative.source)
+        path = self.path(photo.id, derivative.name)
+        with self._pinned([source_path, path]):
+            while True:
+                if not os.path.exists(path):
+                    self._ensure_download(photo, derivative.source)
+                    try:
+                        self._added(_render_once(source_path, path, derivative, self.lock_timeout))
+                    except FileNotFoundError:
+                        continue  # source evicted by another process
+                blob = self.get(photo.id, derivative.name)
+                if blob is not None:
+                    return blob
+
+    def derive_many(self, photos: Iterable[Photo], derivative: Derivative) -> List[str]:
+        """Generate a derivative for many photos across a process pool
+
+        Sources are downloaded first (each at most once), then the missing
+        derivatives are rendered in parallel, each under its blob lock so
+        processes sharing the cache never render the same derivative at
+        once. Sources and derivatives of the
+        batch are pinned until it finishes; if the batch is larger than
+        ``max_bytes``, the oldest of them are evicted afterwards.
+
+        Returns:
+            Paths of the derivatives, in the same order as the photos
+        """
+        photos = list(photos)
+        paths = [self.path(photo.id, derivative.name) for photo in photos]
+        sources = [self.path(photo.id, derivative.source) for photo in photos]
+        with self._pinned(sources + paths):
+            jobs = []
+            for photo, source_path, path in zip(photos, sources, paths):
+                if not os.path.exists(path):
+                    self._ensure_download(photo, derivative.source)
+                    jobs.append((photo, source_path, path))
+            if jobs:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [
+                        executor.submit(
+                            _render_once, source_path, path, derivative, self.lock_timeout
+                        )
+                        for _, source_path, path in jobs
+                    ]
+                    for (photo, source_path, path), future in zip(jobs, futures):
+                        try:
+                            size = future.result()
+                        except FileNotFoundError:
+                            # Source evicted by another process; download it again
+                            self._ensure_download(photo, derivative.source)
+                            size = _render_once(source_path, path, derivative, self.lock_timeout)
+                        self._added(size)
+        return paths
+
+    def size(self) -> int:
+        """Total size in bytes of all cached blobs"""
+        return sum(stat.st_size for stat in map(_stat, self._blobs()) if stat is not None)
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """Remove least recently used blobs until the cache fits target_bytes
+
+        Pinned blobs are skipped.
+
+        Returns:
+            Number of bytes freed
+        """
+        target_bytes = self.max_bytes if target_bytes is None else target_bytes
+        with self._lock:
+            entries = [(_stat(entry), entry.path) for entry in self._blobs()]
+            entries = [(stat, path) for stat, path in entries if stat is not None]
+            entries.sort(key=lambda item: item[0].st_mtime)
+            total = sum(stat.st_size for stat, _ in entries)
+            freed = 0
+            for stat, path in entries:
+                if total - freed <= target_bytes:
+                    break
+                if path in self._pins:
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass  # evicted by another process
+                freed += stat.st_size
+            self._size = total - freed
+        return freed
+
+    def _blobs(self):
+        """Yield directory entries for every stored blob"""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith((".tmp", ".lock")):
+                    yield entry
+
+    def _added(self, size: int) -> None:
+        """Account for a new blob and evict down to 90% when over budget"""
+        with self._lock:
+            self._size += size
+        self._trim()
+
+    def _trim(self) -> None:
+        """Evict down to 90% of the budget when over it"""
+        with self._lock:
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict(int(self.max_bytes * 0.9))
+
+    @contextmanager
+    def _pinned(self, paths: List[str]):
+        """Protect blobs from eviction while they are in use"""
+        with self._lock:
+            for path in paths:
+                self._pins[path] = self._pins.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                for path in paths:
+                    self._pins[path] -= 1
+                    if not self._pins[path]:
+                        del self._pins[path]
+            self._trim()
+
+    def _ensure_download(self, photo: Photo, variant: str) -> str:
+        """Download a URL variant unless it is already cached; return its path"""
+        path = self.path(photo.id, variant)
+        if os.path.exists(path):
+            return path
+        url = photo.urls.get(variant)
+        if not url:
+            raise UnsplashError(f"Photo {photo.id} has no '{variant}' URL")
+        with _blob_lock(path, self.lock_timeout):
+            if not os.path.exists(path):
+                response = self.transport.request("GET", url)
+                if not response.ok:
+                    raise UnsplashError(f"Image download failed: {response.status_code} - {url}")
+                if not response.content:
+                    raise UnsplashError(f"Image download returned no data: {url}")
+                self.put(photo.id, variant, response.content)
+        return path
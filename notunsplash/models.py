@@ -1,6 +1,8 @@
 """
 Data models for the Unsplash API
 """
+import threading
+import weakref
 from typing import Dict, Optional, List
 from datetime import datetime
 from dateutil.parser import parse as parse_date
@@ -33,9 +35,78 @@ class User:
         self.profile_medium = profile_image.get("medium")
         self.profile_large = profile_image.get("large")
 
+class UserIdentityMap:
+    """Weak identity map that shares one User object per user id
+    
+    Models built with the same map reuse the User already created for a given
+    id instead of building a duplicate. Entries are held weakly, so a user is
+    dropped from the map as soon as no photo, collection or topic refers to it.
+    """
+    def __init__(self):
+        self._users = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, data: Dict) -> User:
+        """Return the shared User for this payload, creating it if needed"""
+        user_id = data.get("id")
+        if user_id is None:
+            return User(data)
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = User(data)
+                self._users[user_id] = user
+            return user
+
+    def refresh(self, data: Dict) -> User:
+        """Return the shared User for this payload, updated with its fields
+        
+        Used for full profile payloads, so objects first built from the
+        shorter nested user payloads pick up the complete profile.
+        """
+        user_id = data.get("id")
+        if user_id is None:
+            return User(data)
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = User(data)
+                self._users[user_id] = user
+            else:
+                user.__dict__.update(User(data).__dict__)
+            return user
+
+    def intern(self, user: User) -> User:
+        """Return the shared User with this user's id, adopting user if there is none
+        
+        Used for users built elsewhere, e.g. unpickled from a worker process.
+        """
+        if user.id is None:
+            return user
+        with self._lock:
+            shared = self._users.get(user.id)
+            if shared is None:
+                self._users[user.id] = shared = user
+            return shared
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    def clear(self) -> None:
+        """Forget all interned users"""
+        with self._lock:
+            self._users.clear()
+
+def _build_user(data: Dict, users: Optional[UserIdentityMap]) -> User:
+    """Build a User, interning it through the identity map when one is given"""
+    return users.get(data) if users is not None else User(data)
+
 class Photo:
     """Unsplash photo model"""
-    def __init__(self, data: Dict):
+    def __init__(self, data: Dict, users: Optional[UserIdentityMap] = None):
         # Basic metadata
         self.id = data.get("id")
         self.created_at = parse_date(data.get("created_at")) if data.get("created_at") else None
@@ -68,7 +139,7 @@ class Photo:
         
         # User info
         user_data = data.get("user", {})
-        self.user = User(user_data) if user_data else None
+        self.user = _build_user(user_data, users) if user_data else None
         
         # Location info
         location = data.get("location", {})
@@ -94,7 +165,7 @@ class Photo:
 
 class Collection:
     """Unsplash collection model"""
-    def __init__(self, data: Dict):
+    def __init__(self, data: Dict, users: Optional[UserIdentityMap] = None):
         self.id = data.get("id")
         self.title = data.get("title")
         self.description = data.get("description")
@@ -114,15 +185,15 @@ class Collection:
         
         # Cover photo
         cover_photo = data.get("cover_photo", {})
-        self.cover_photo = Photo(cover_photo) if cover_photo else None
+        self.cover_photo = Photo(cover_photo, users) if cover_photo else None
         
         # User info
         user_data = data.get("user", {})
-        self.user = User(user_data) if user_data else None
+        self.user = _build_user(user_data, users) if user_data else None
 
 class Topic:
     """Unsplash topic model"""
-    def __init__(self, data: Dict):
+    def __init__(self, data: Dict, users: Optional[UserIdentityMap] = None):
         self.id = data.get("id")
         self.slug = data.get("slug")
         self.title = data.get("title")
@@ -132,8 +203,8 @@ class Topic:
         self.featured = data.get("featured", False)
         self.total_photos = data.get("total_photos", 0)
         self.status = data.get("status", "unknown")
-        self.owners = [User(owner) for owner in data.get("owners", [])]
-        self.cover_photo = Photo(data.get("cover_photo")) if data.get("cover_photo") else None
+        self.owners = [_build_user(owner, users) for owner in data.get("owners", [])]
+        self.cover_photo = Photo(data.get("cover_photo"), users) if data.get("cover_photo") else None
         self._raw = data
         
         # Links
@@ -143,4 +214,22 @@ class Topic:
         
         # Preview photos
         preview_photos = data.get("preview_photos", [])
-        self.preview_photos = [Photo(photo) for photo in preview_photos] if preview_photos else []
+        self.preview_photos = [Photo(photo, users) for photo in preview_photos] if preview_photos else []
+
+class Statistics:
+    """Download, view and like statistics for a user or photo"""
+    def __init__(self, data: Dict):
+        self.id = data.get("id")
+        self.username = data.get("username")
+        
+        for metric in ("downloads", "views", "likes"):
+            values = data.get(metric, {})
+            historical = values.get("historical", {})
+            setattr(self, metric, values.get("total", 0))
+            setattr(self, f"{metric}_change", historical.get("change", 0))
+            setattr(self, f"{metric}_history", [
+                (parse_date(point["date"]), point.get("value", 0))
+                for point in historical.get("values", [])
+                if point.get("date")
+            ])
+        self._raw = data
@@ -0,0 +1,80 @@
+"""Bulk parsing of archived API payloads into models"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from .models import Photo, UserIdentityMap
+
+Payload = Union[bytes, str, Dict]
+
+def _load(payload: Payload) -> Dict:
+    """Decode a raw JSON payload, passing dicts through unchanged"""
+    if isinstance(payload, (bytes, bytearray, str)):
+        return json.loads(payload)
+    return payload
+
+def _parse_chunk(chunk: List[Payload], users: Optional[UserIdentityMap] = None) -> List[Photo]:
+    """Build photos for one chunk of payloads (runs in a worker process)"""
+    return [Photo(_load(payload), users) for payload in chunk]
+
+def _interned(photos: List[Photo], users: Optional[UserIdentityMap]) -> List[Photo]:
+    """Point photos parsed in a worker at the shared users of this process"""
+    if users is not None:
+        for photo in photos:
+            if photo.user is not None:
+                photo.user = users.intern(photo.user)
+    return photos
+
+def _chunks(payloads: Iterable[Payload], chunk_size: int) -> Iterator[List[Payload]]:
+    """Split an iterable into lists of at most chunk_size items"""
+    iterator = iter(payloads)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_photos(
+    payloads: Iterable[Payload],
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    max_pending: Optional[int] = None,
+    users: Optional[UserIdentityMap] = None
+) -> Iterator[Photo]:
+    """Parse photo payloads into Photo objects across a process pool
+
+    Args:
+        payloads: Iterable of JSON bytes/strings or already decoded dicts,
+            such as dumps of ``Photo._raw``
+        workers: Number of worker processes. Defaults to the CPU count;
+            1 or less parses in the current process
+        chunk_size: Number of payloads sent to a worker at a time
+        max_pending: Maximum number of chunks in flight. Defaults to twice
+            the number of workers, which bounds memory for endless inputs
+        users: Identity map to intern photographers through. Workers cannot
+            share it, so users parsed there are interned as each chunk
+            comes back
+
+    Yields:
+        Photo objects in the same order as the input payloads
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in _chunks(payloads, chunk_size):
+            yield from _parse_chunk(chunk, users)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(payloads, chunk_size):
+            pending.append(executor.submit(_parse_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from _interned(pending.popleft().result(), users)
+        while pending:
+            yield from _interned(pending.popleft().result(), users)
@@ -0,0 +1,202 @@
+"""Color and aspect-ratio similarity index over photos
+
+Requires NumPy (``pip install notunsplash[analytics]``).
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from .frame import _HEX_COLOR, _parse_colors, _require_numpy, np
+from .models import Photo
+
+def rgb_to_lab(rgb: "np.ndarray") -> "np.ndarray":
+    """Convert an (n, 3) array of sRGB values (0-255) to CIE Lab (D65)"""
+    srgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(srgb > 0.04045, ((srgb + 0.055) / 1.055) ** 2.4, srgb / 12.92)
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ])
+    xyz /= np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lab = np.empty_like(f)
+    lab[:, 0] = 116 * f[:, 1] - 16
+    lab[:, 1] = 500 * (f[:, 0] - f[:, 1])
+    lab[:, 2] = 200 * (f[:, 1] - f[:, 2])
+    return lab.astype(np.float32)
+
+class _Bucket:
+    """Growable arrays for the photos in one aspect-ratio bucket"""
+    def __init__(self):
+        self.lab = np.empty((16, 3), dtype=np.float32)
+        self.log_aspect = np.empty(16, dtype=np.float32)
+        self.ids: List[str] = []
+
+    def append(self, photo_id: str, lab: "np.ndarray", log_aspect: float) -> int:
+        """Add a row and return its position"""
+        size = len(self.ids)
+        if size == len(self.log_aspect):
+            self.lab = np.concatenate([self.lab, np.empty_like(self.lab)])
+            self.log_aspect = np.concatenate([self.log_aspect, np.empty_like(self.log_aspect)])
+        self.lab[size] = lab
+        self.log_aspect[size] = log_aspect
+        self.ids.append(photo_id)
+        return size
+
+    def remove(self, row: int) -> Optional[str]:
+        """Remove a row by moving the last row into its place
+
+        Returns:
+            Id of the photo that moved to ``row``, if any
+        """
+        last = len(self.ids) - 1
+        moved = None
+        if row != last:
+            self.lab[row] = self.lab[last]
+            self.log_aspect[row] = self.log_aspect[last]
+            self.ids[row] = moved = self.ids[last]
+        self.ids.pop()
+        return moved
+
+class ColorIndex:
+    """Nearest-neighbour index over photo colors, bucketed by aspect ratio
+
+    Colors are compared by Euclidean distance in CIE Lab, which tracks
+    perceived difference far better than RGB. Photos are grouped into buckets
+    of similar log aspect ratio so shape-constrained queries only scan the
+    buckets that can match. Photos can be added at any time; re-adding a photo
+    id replaces the stored photo, including its color and shape.
+    """
+    def __init__(self, bucket_width: float = 0.05):
+        """Initialize the index
+
+        Args:
+            bucket_width: Width of an aspect-ratio bucket in log space
+                (0.05 groups ratios within about 5% of each other)
+        """
+        _require_numpy()
+        self.bucket_width = bucket_width
+        self._buckets: Dict[int, _Bucket] = {}
+        self._photos: Dict[str, Photo] = {}
+        self._rows: Dict[str, Tuple[int, int]] = {}  # photo id -> (bucket key, row)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._photos)
+
+    def __contains__(self, photo_id: str) -> bool:
+        return photo_id in self._photos
+
+    def add(self, photos: Iterable[Photo]) -> int:
+        """Add photos to the index
+
+        Photos without a valid '#rrggbb' color or dimensions are skipped.
+
+        Returns:
+            Number of photos newly added
+        """
+        valid: Dict[str, Photo] = {}
+        for photo in photos:
+            if not photo.id or not photo.width or not photo.height:
+                continue
+            if not photo.color or not _HEX_COLOR.fullmatch(photo.color):
+                continue
+            valid[photo.id] = photo
+        if not valid:
+            return 0
+        labs = rgb_to_lab(_parse_colors([photo.color for photo in valid.values()]))
+        added = 0
+        with self._lock:
+            for photo, lab in zip(valid.values(), labs):
+                if photo.id in self._rows:
+                    self._remove_row(photo.id)
+                else:
+                    added += 1
+                self._photos[photo.id] = photo
+                log_aspect = math.log(photo.width / photo.height)
+                bucket_key = math.floor(log_aspect / self.bucket_width)
+                bucket = self._buckets.get(bucket_key)
+                if bucket is None:
+                    bucket = self._buckets[bucket_key] = _Bucket()
+                self._rows[photo.id] = (bucket_key, bucket.append(photo.id, lab, log_aspect))
+        return added
+
+    def _remove_row(self, photo_id: str) -> None:
+        """Drop a photo's color and shape from its bucket (lock held)"""
+        bucket_key, row = self._rows.pop(photo_id)
+        bucket = self._buckets[bucket_key]
+        moved = bucket.remove(row)
+        if moved is not None:
+            self._rows[moved] = (bucket_key, row)
+        if not bucket.ids:
+            del self._buckets[bucket_key]
+
+    def query(
+        self,
+        color: str,
+        aspect_ratio: Optional[float] = None,
+        k: int = 10,
+        aspect_tolerance: float = 0.05
+    ) -> List[Tuple[Photo, float]]:
+        """Find the photos closest to a color, optionally matching a shape
+
+        Args:
+            color: Target color as '#rrggbb'
+            aspect_ratio: Target width/height ratio (e.g. 16 / 9), or None
+                to search every shape
+            k: Maximum number of results
+            aspect_tolerance: Allowed relative difference in aspect ratio,
+                measured in log space
+
+        Returns:
+            List of (photo, Lab distance) pairs, closest first
+
+        Raises:
+            ValueError: If color is not '#rrggbb' or aspect_ratio is not positive
+        """
+        if not isinstance(color, str) or not _HEX_COLOR.fullmatch(color):
+            raise ValueError(f"Color must be '#rrggbb', got {color!r}")
+        if aspect_ratio is not None and not aspect_ratio > 0:
+            raise ValueError(f"Aspect ratio must be positive, got {aspect_ratio!r}")
+        target = rgb_to_lab(_parse_colors([color]))[0]
+        with self._lock:
+            if aspect_ratio is None:
+                keys = list(self._buckets)
+            else:
+                log_target = math.log(aspect_ratio)
+                low = math.floor((log_target - aspect_tolerance) / self.bucket_width)
+                high = math.floor((log_target + aspect_tolerance) / self.bucket_width)
+                keys = [key for key in range(low, high + 1) if key in self._buckets]
+
+            labs, buckets, positions = [], [], []
+            for key in keys:
+                bucket = self._buckets[key]
+                size = len(bucket.ids)
+                if aspect_ratio is None:
+                    rows = np.arange(size)
+                    lab = bucket.lab[:size]
+                else:
+                    rows = np.flatnonzero(
+                        np.abs(bucket.log_aspect[:size] - log_target) <= aspect_tolerance
+                    )
+                    lab = bucket.lab[rows]
+                if len(rows):
+                    labs.append(lab)
+                    buckets.append(bucket)
+                    positions.append(rows)
+            if not labs:
+                return []
+
+            diff = np.concatenate(labs) - target
+            distances = np.einsum("ij,ij->i", diff, diff)  # squared; rooted for the top k only
+            offsets = np.cumsum([0] + [len(rows) for rows in positions])
+            k = min(k, len(distances))
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+            results = []
+            for i in nearest:
+                owner = int(np.searchsorted(offsets, i, side="right")) - 1
+                bucket = buckets[owner]
+                photo_id = bucket.ids[positions[owner][i - offsets[owner]]]
+                results.append((self._photos[photo_id], math.sqrt(distances[i])))
+            return results
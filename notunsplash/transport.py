@@ -0,0 +1,118 @@
+"""Pluggable HTTP transports for the Unsplash client"""
+import json
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from .errors import UnsplashError, UnsplashTimeoutError, UnsplashConnectionError
+
+class TransportResponse:
+    """Transport-independent HTTP response
+
+    Header lookups are case-insensitive whatever casing the transport or
+    cassette used.
+    """
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+class Transport:
+    """Base class for HTTP transports
+
+    A transport sends a single request and returns a TransportResponse.
+    Transports must be safe to call from several threads at once and raise
+    UnsplashTimeoutError when ``timeout`` seconds pass without a response, or
+    UnsplashConnectionError when the connection fails before a response.
+    """
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any pooled connections"""
+        pass
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport backed by a pooled requests session"""
+    def __init__(self, session: Optional[requests.Session] = None, pool_maxsize: int = 10):
+        self.session = session or requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        try:
+            response = self.session.request(
+                method, url, headers=headers, params=params, data=data, timeout=timeout
+            )
+        except requests.Timeout as e:
+            raise UnsplashTimeoutError(f"Request timed out: {method} {url}") from e
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            raise UnsplashConnectionError(f"Connection failed: {method} {url}: {e}") from e
+        return TransportResponse(response.status_code, response.content, response.headers)
+
+    def close(self) -> None:
+        self.session.close()
+
+class HTTP2Transport(Transport):
+    """HTTP/2 transport backed by httpx
+
+    Concurrent requests from several threads are multiplexed as streams over
+    a single connection per host instead of opening one connection each.
+    Requires ``pip install notunsplash[http2]``.
+    """
+    def __init__(self, client=None, max_connections: int = 10, prior_knowledge: bool = False):
+        """Initialize the transport
+
+        Args:
+            client: Pre-configured ``httpx.Client`` to use instead of a new one
+            max_connections: Maximum number of connections kept in the pool
+            prior_knowledge: Speak HTTP/2 over cleartext without negotiation
+                (only useful for local test servers)
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise UnsplashError("HTTP2Transport requires httpx: pip install notunsplash[http2]")
+        self._timeout_error = httpx.TimeoutException
+        self._connection_errors = (httpx.NetworkError, httpx.RemoteProtocolError)
+        self.client = client or httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections)
+        )
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        try:
+            response = self.client.request(
+                method, url, headers=headers, params=params, data=data, **kwargs
+            )
+        except self._timeout_error as e:
+            raise UnsplashTimeoutError(f"Request timed out: {method} {url}") from e
+        except self._connection_errors as e:
+            raise UnsplashConnectionError(f"Connection failed: {method} {url}: {e}") from e
+        return TransportResponse(response.status_code, response.content, response.headers)
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,11 @@
+"""Small helpers shared across modules"""
+import math
+from typing import Sequence
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 if empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
@@ -0,0 +1,154 @@
+"""Write-behind queue for like/unlike requests"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from .errors import UnsplashError, UnsplashTimeoutError, UnsplashConnectionError
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request is worth retrying"""
+    if isinstance(error, (UnsplashTimeoutError, UnsplashConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if not isinstance(error, UnsplashError) or status is None:
+        return False
+    return status == 429 or status >= 500
+
+class WriteBehindQueue:
+    """Queue that batches like/unlike intents and sends them in the background
+
+    Intents are keyed by (authorization, photo id) and coalesced before they
+    are sent: liking a photo twice sends one request, and liking then
+    unliking it before the next flush sends nothing. The queue flushes when
+    ``max_pending`` intents are waiting or every ``flush_interval`` seconds,
+    sending requests concurrently and retrying transient failures (timeouts,
+    connection errors, 429 and 5xx responses) with exponential backoff.
+    Call ``flush()`` or ``close()`` at shutdown to send what is left.
+    """
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        max_pending: int = 50,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        workers: int = 4,
+        on_error: Optional[Callable[[str, bool, Exception], None]] = None
+    ):
+        """Initialize the queue
+
+        Args:
+            flush_interval: Maximum seconds an intent waits before being sent
+            max_pending: Number of waiting intents that triggers an early flush
+            max_retries: Retries per request after the first failure
+            backoff: Delay before the first retry, doubled for each further one
+            workers: Number of requests sent concurrently
+            on_error: Called as on_error(photo_id, like, exception) when a
+                request fails permanently or still fails after all retries
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.on_error = on_error
+        self.stats = {"queued": 0, "coalesced": 0, "sent": 0, "failed": 0}
+
+        self._pending: Dict[Tuple[str, str], bool] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notunsplash-writes")
+        self._send: Optional[Callable[[str, str, bool], None]] = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def start(self, send: Callable[[str, str, bool], None]) -> None:
+        """Start the background flusher
+
+        Args:
+            send: Function called as send(authorization, photo_id, like) to
+                perform one request; the client passes its own
+        """
+        self._send = send
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="notunsplash-flusher", daemon=True)
+            self._thread.start()
+
+    def put(self, authorization: str, photo_id: str, like: bool) -> None:
+        """Queue a like (like=True) or unlike intent
+
+        Raises:
+            UnsplashError: If the queue has been closed
+        """
+        key = (authorization, photo_id)
+        with self._condition:
+            if self._closed:
+                raise UnsplashError("Write queue is closed")
+            self.stats["queued"] += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = like
+            elif pending == like:
+                self.stats["coalesced"] += 1
+            else:
+                # Opposite intents cancel out
+                del self._pending[key]
+                self.stats["coalesced"] += 2
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def flush(self) -> int:
+        """Send all waiting intents and wait for them to finish
+
+        Returns:
+            Number of requests that succeeded
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            futures = [
+                self._executor.submit(self._send_with_retries, authorization, photo_id, like)
+                for (authorization, photo_id), like in batch.items()
+            ]
+            return sum(1 for future in futures if future.result())
+
+    def close(self) -> None:
+        """Stop the background flusher and send everything still waiting"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and len(self._pending) < self.max_pending:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _send_with_retries(self, authorization: str, photo_id: str, like: bool) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._send(authorization, photo_id, like)
+                with self._condition:
+                    self.stats["sent"] += 1
+                return True
+            except Exception as e:
+                if not _is_transient(e) or attempt == self.max_retries:
+                    with self._condition:
+                        self.stats["failed"] += 1
+                    if self.on_error is not None:
+                        self.on_error(photo_id, like, e)
+                    return False
+                time.sleep(self.backoff * 2 ** attempt)
+        return False
@@ -9,6 +9,14 @@ setup(
         "python-dateutil>=2.8.2",
         "urllib3>=2.0.7",
     ],
+    entry_points={
+        "console_scripts": ["notunsplash=notunsplash.cli:main"],
+    },
+    extras_require={
+        "analytics": ["numpy>=1.22"],
+        "http2": ["httpx[http2]>=0.24"],
+        "images": ["Pillow>=9.0"],
+    },
     author="Robert Jones",
     author_email="your.email@example.com",
     description="A Python SDK for the Unsplash API",
@@ -0,0 +1,37 @@
+import json
+import threading
+import time
+import pytest
+from notunsplash.transport import Transport, TransportResponse
+
+class FakeTransport(Transport):
+    """Transport answering from a handler, recording every request
+
+    handler(method, url, params) returns (status, body) or a body dict/list;
+    delay is the number of seconds each request takes.
+    """
+    def __init__(self, handler=None, delay: float = 0.0):
+        self.handler = handler or (lambda method, url, params: {})
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        with self._lock:
+            self.requests.append({
+                "method": method, "url": url, "headers": headers, "params": params, "timeout": timeout
+            })
+        if self.delay:
+            time.sleep(self.delay)
+        result = self.handler(method, url, params)
+        status, body = result if isinstance(result, tuple) else (200, result)
+        return TransportResponse(status, json.dumps(body).encode())
+
+@pytest.fixture
+def make_transport():
+    """Factory for FakeTransport instances"""
+    return FakeTransport
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
@@ -0,0 +1,75 @@
+import threading
+import time
+from notunsplash import QueryCache, Unsplash
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.done.set()
+        return self.calls
+
+def test_fresh_entries_are_served_from_memory():
+    cache = QueryCache(ttl=60)
+    fetch = Counter()
+    assert cache.get("q", fetch) == 1
+    assert cache.get("q", fetch) == 1
+    assert fetch.calls == 1
+    assert (cache.stats["hits"], cache.stats["misses"]) == (1, 1)
+    cache.close()
+
+def test_stale_entries_are_served_while_revalidating():
+    cache = QueryCache(ttl=0.01, stale_ttl=60)
+    fetch = Counter()
+    cache.get("q", fetch)
+    time.sleep(0.02)
+    fetch.done.clear()
+    assert cache.get("q", fetch) == 1
+    assert fetch.done.wait(5)
+    cache.close()
+    assert cache.get("q", fetch) == 2
+    assert cache.stats["stale_hits"] == 1
+
+def test_closed_cache_does_not_revalidate():
+    cache = QueryCache(ttl=0.01, stale_ttl=60)
+    fetch = Counter()
+    cache.get("q", fetch)
+    cache.close()
+    time.sleep(0.02)
+    assert cache.get("q", fetch) == 1
+    assert fetch.calls == 1
+
+def test_request_counts_stay_bounded():
+    cache = QueryCache(max_entries=5)
+
+    def failing():
+        raise RuntimeError("unavailable")
+
+    for i in range(100):
+        cache.get(("cached", i), Counter())
+        try:
+            cache.get(("failed", i), failing)
+        except RuntimeError:
+            pass
+    assert len(cache._frequency) <= 2 * cache.max_entries + 1
+    assert len(cache.hot_keys()) == 5
+    cache.invalidate()
+    assert cache._frequency == {}
+    cache.close()
+
+def test_search_results_are_cached_per_token(make_transport):
+    transport = make_transport(lambda method, url, params: {"results": [{"id": "a"}]})
+    cache = QueryCache()
+    public = Unsplash("key", transport=transport, cache=cache)
+    user = Unsplash("key", transport=transport, cache=cache)
+    user.set_oauth_token("token")
+    public.search_photos("nature")
+    public.search_photos("nature")
+    user.search_photos("nature")
+    assert [request["headers"]["Authorization"] for request in transport.requests] == [
+        "Client-ID key", "Bearer token"
+    ]
+    cache.close()
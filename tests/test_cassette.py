@@ -0,0 +1,73 @@
+import gzip
+import json
+import time
+import pytest
+from notunsplash import RecordingTransport, ReplayTransport, Unsplash, UnsplashError, run_load
+from notunsplash.transport import Transport, TransportResponse
+
+class LiveTransport(Transport):
+    """Stands in for the network, with lowercase header names like httpx"""
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        self.calls += 1
+        headers = {"x-ratelimit-limit": "50", "x-ratelimit-remaining": str(50 - self.calls)}
+        if url.endswith("/oauth/token"):
+            body = {"access_token": "SECRET-TOKEN", "refresh_token": "SECRET-REFRESH", "scope": "public"}
+            return TransportResponse(200, json.dumps(body).encode(), {**headers, "set-cookie": "s=SECRET"})
+        page = (params or {}).get("page", 1)
+        body = {"results": [{"id": f"{page}-{self.calls}"}]}
+        return TransportResponse(200, json.dumps(body).encode(), headers)
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = str(tmp_path / "session.ndjson.gz")
+    client = Unsplash("key", secret_key="secret", transport=RecordingTransport(LiveTransport(), path))
+    client.search_photos("nature", page=1)
+    client.search_photos("nature", page=1)
+    client.search_photos("nature", page=2)
+    client.get_oauth_token("code", "https://example.com/callback")
+    client.close()
+    return path
+
+def test_credentials_are_not_recorded(cassette):
+    with gzip.open(cassette, "rt") as recorded:
+        text = recorded.read()
+    assert "SECRET" not in text
+    assert "key" not in text  # request headers are never written
+    assert "[REDACTED]" in text
+
+def test_replay_serves_recordings_in_order_and_cycles(cassette):
+    client = Unsplash("key", transport=ReplayTransport(cassette, speed=0))
+    ids = [client.search_photos("nature", page=1)[0].id for _ in range(3)]
+    assert ids == ["1-1", "1-2", "1-1"]
+    assert client.search_photos("nature", page=2)[0].id == "2-3"
+
+def test_replayed_headers_are_case_insensitive(cassette):
+    client = Unsplash("key", transport=ReplayTransport(cassette, speed=0))
+    client.search_photos("nature", page=2)
+    assert (client.rate_limit, client.rate_limit_remaining) == (50, 47)
+
+def test_unrecorded_requests_fail(cassette):
+    client = Unsplash("key", transport=ReplayTransport(cassette, speed=0))
+    with pytest.raises(UnsplashError):
+        client.search_photos("city")
+
+def test_replay_scales_latency(tmp_path):
+    path = str(tmp_path / "slow.ndjson")
+    entry = {"elapsed": 0.2, "method": "GET", "url": "https://api.unsplash.com/photos/a",
+             "params": {}, "status": 200, "headers": {}, "body": "{\"id\": \"a\"}"}
+    with open(path, "w") as cassette:
+        cassette.write(json.dumps(entry) + "\n")
+    replay = ReplayTransport(path, speed=4.0)
+    started = time.monotonic()
+    assert replay.request("GET", "https://api.unsplash.com/photos/a").json() == {"id": "a"}
+    assert 0.04 <= time.monotonic() - started < 0.15
+
+def test_run_load_reports_errors_and_latency(cassette):
+    client = Unsplash("key", transport=ReplayTransport(cassette, speed=0))
+    report = run_load(lambda query: client.search_photos(query), ["nature", "city"] * 5, concurrency=4)
+    assert report.requests == 10
+    assert report.errors == 5
+    assert report.percentile(0.99) >= report.percentile(0.5) >= 0
@@ -0,0 +1,85 @@
+import io
+import json
+import threading
+import pytest
+from requests.structures import CaseInsensitiveDict
+from notunsplash import Unsplash
+from notunsplash.cli import RateLimiter, Reporter, _extension, build_parser, fetch_ids, download, run_jobs
+
+class ClosedPipe(io.StringIO):
+    def write(self, text):
+        raise BrokenPipeError("reader went away")
+
+def photo_api(method, url, params):
+    if "/download" in url:
+        return {"url": "https://images.unsplash.com/photo"}
+    if url.startswith("https://images.unsplash.com"):
+        return "image"
+    photo_id = url.rsplit("/", 1)[1]
+    return {"id": photo_id, "urls": {"regular": f"https://images.unsplash.com/{photo_id}?fm=jpg"},
+            "links": {"download_location": f"https://api.unsplash.com/photos/{photo_id}/download"}}
+
+def run(job, items, client, workers=2, **kwargs):
+    output = kwargs.pop("output", io.StringIO())
+    with Reporter(stream=io.StringIO()) as reporter:
+        run_jobs(job, items, workers, RateLimiter(None), reporter, client, output=output, **kwargs)
+    return [json.loads(line) for line in output.getvalue().splitlines()], reporter
+
+def test_results_and_errors_are_written_as_lines(transport):
+    client = Unsplash("key", transport=transport)
+
+    def job(item):
+        if item == "bad":
+            raise ValueError("no such photo")
+        return [{"id": item}, {"id": item + "!"}]
+
+    lines, reporter = run(job, ["a", "bad"], client)
+    assert sorted(map(json.dumps, lines)) == sorted(map(json.dumps, [
+        {"id": "a"}, {"id": "a!"}, {"item": "bad", "error": "no such photo"}
+    ]))
+    assert (len(reporter.latencies), reporter.errors) == (2, 1)
+
+def test_output_errors_stop_new_jobs(transport):
+    client = Unsplash("key", transport=transport)
+    started = []
+    lock = threading.Lock()
+
+    def job(item):
+        with lock:
+            started.append(item)
+        return {"id": item}
+
+    with pytest.raises(BrokenPipeError):
+        run(job, map(str, range(1000)), client, workers=1, output=ClosedPipe())
+    assert len(started) < 1000
+
+def test_no_jobs_start_within_the_rate_limit_reserve(transport):
+    client = Unsplash("key", transport=transport)
+    client.rate_limit_remaining = 5
+    lines, _ = run(lambda item: {"id": item}, ["a", "b"], client, reserve=5)
+    assert lines == []
+
+def test_fetch_ids_fetches_full_metadata(make_transport):
+    transport = make_transport(photo_api)
+    client = Unsplash("key", transport=transport)
+    job, items = fetch_ids(client, build_parser().parse_args(["fetch-ids", "a", '{"id": "b"}']))
+    assert [job(item)["id"] for item in items] == ["a", "b"]
+    assert [request["url"] for request in transport.requests] == [
+        "https://api.unsplash.com/photos/a", "https://api.unsplash.com/photos/b"
+    ]
+
+def test_download_saves_the_image_and_tracks_it(make_transport, tmp_path):
+    transport = make_transport(photo_api)
+    client = Unsplash("key", transport=transport)
+    args = build_parser().parse_args(["download", "a", "--output", str(tmp_path)])
+    job, items = download(client, args)
+    result = job(next(iter(items)))
+    assert result["path"] == str(tmp_path / "a-regular.jpg")
+    assert (tmp_path / "a-regular.jpg").read_bytes() == b'"image"'
+    assert transport.requests[-1]["url"] == "https://api.unsplash.com/photos/a/download"
+
+def test_extension_prefers_content_type():
+    url = "https://images.unsplash.com/photo?fm=jpg"
+    assert _extension(url, CaseInsensitiveDict({"content-type": "image/webp; q=1"})) == ".webp"
+    assert _extension(url, CaseInsensitiveDict()) == ".jpg"
+    assert _extension("https://images.unsplash.com/photo", CaseInsensitiveDict()) == ""
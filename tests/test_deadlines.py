@@ -0,0 +1,53 @@
+import time
+import pytest
+from notunsplash import Unsplash, UnsplashBatchError, UnsplashTimeoutError
+
+def user_photos(method, url, params):
+    return [{"id": f"{params['page']}-{i}", "urls": {}} for i in range(2)]
+
+def user(method, url, params):
+    username = url.rsplit("/", 1)[1]
+    return {"id": username, "username": username}
+
+def test_pagination_shares_one_deadline(make_transport):
+    transport = make_transport(user_photos, delay=0.05)
+    client = Unsplash("key", transport=transport)
+    photos = client.iter_user_photos("someone", per_page=2, deadline=0.12)
+
+    seen = []
+    with pytest.raises(UnsplashTimeoutError):
+        for photo in photos:
+            seen.append(photo.id)
+
+    assert seen == ["1-0", "1-1", "2-0", "2-1"]
+    timeouts = [request["timeout"] for request in transport.requests]
+    assert timeouts == sorted(timeouts, reverse=True)
+    assert timeouts[0] <= 0.12
+
+def test_expired_deadline_sends_nothing(transport):
+    client = Unsplash("key", transport=transport)
+    with pytest.raises(UnsplashTimeoutError):
+        client.get_photo("abc", deadline=0)
+    assert transport.requests == []
+
+def test_deadline_bounds_a_slow_response(make_transport):
+    # The fake ignores its timeout, like a response that keeps trickling in
+    transport = make_transport(lambda method, url, params: {"id": "abc"}, delay=0.5)
+    client = Unsplash("key", transport=transport)
+    started = time.monotonic()
+    with pytest.raises(UnsplashTimeoutError):
+        client.get_photo("abc", deadline=0.1)
+    assert time.monotonic() - started < 0.3
+
+def test_get_users_shares_one_deadline(make_transport):
+    transport = make_transport(user, delay=0.05)
+    client = Unsplash("key", transport=transport)
+    with pytest.raises(UnsplashBatchError) as excinfo:
+        client.get_users(["a", "b", "c", "d", "e"], max_workers=1, deadline=0.12)
+
+    results, errors = excinfo.value.results, excinfo.value.errors
+    assert list(results) == ["a", "b"]
+    assert set(errors) == {"c", "d", "e"}
+    assert all(isinstance(error, UnsplashTimeoutError) for error in errors.values())
+    # Users past the deadline are not requested at all
+    assert len(transport.requests) == 3
@@ -0,0 +1,68 @@
+import io
+import random
+import pytest
+from notunsplash import Photo
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+from notunsplash import Deduplicator  # noqa: E402
+from notunsplash.dedup import hamming, popcount  # noqa: E402
+
+def picture(seed, size=(200, 150), quality=90):
+    """Blocky image whose structure survives resizing and recompression"""
+    rng = random.Random(seed)
+    small = Image.new("L", (8, 6))
+    small.putdata([rng.randrange(256) for _ in range(48)])
+    buffer = io.BytesIO()
+    small.resize(size, Image.BILINEAR).convert("RGB").save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+class Thumbs:
+    def __init__(self, images):
+        self.images = images
+        self.calls = []
+
+    def __call__(self, photo):
+        self.calls.append(photo.id)
+        if photo.id not in self.images:
+            raise OSError("not found")
+        return self.images[photo.id]
+
+def photos(*ids):
+    return [Photo({"id": photo_id, "urls": {}}) for photo_id in ids]
+
+@pytest.fixture
+def thumbs():
+    return Thumbs({
+        "a": picture(1),
+        "a-small": picture(1, size=(120, 90), quality=60),
+        "b": picture(2),
+        "c": picture(3),
+    })
+
+@pytest.mark.parametrize("method", ["dhash", "phash"])
+def test_near_duplicates_are_dropped(thumbs, method):
+    dedup = Deduplicator(method=method, threshold=8, fetch=thumbs)
+    kept = [photo.id for photo in dedup.filter(photos("a", "b", "a-small", "c"), batch_size=2)]
+    assert kept == ["a", "b", "c"]
+
+def test_photos_are_hashed_once(thumbs):
+    dedup = Deduplicator(fetch=thumbs)
+    list(dedup.filter(photos("a", "b")))
+    dedup.reset()
+    assert [photo.id for photo in dedup.filter(photos("a", "b", "a"))] == ["a", "b"]
+    assert sorted(thumbs.calls) == ["a", "b"]
+
+def test_unfetchable_photos_pass_through(thumbs):
+    dedup = Deduplicator(fetch=thumbs)
+    assert [photo.id for photo in dedup.filter(photos("gone", "a", "gone"))] == ["gone", "a", "gone"]
+    assert "gone" not in dedup.hashes
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        Deduplicator(method="ahash", fetch=Thumbs({}))
+
+def test_hamming_distance():
+    hashes = np.array([0, 0xFF, 2 ** 64 - 1], dtype=np.uint64)
+    assert popcount(hashes).tolist() == [0, 8, 64]
+    assert hamming(hashes, 0x0F).tolist() == [4, 4, 60]
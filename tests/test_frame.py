@@ -0,0 +1,40 @@
+import pytest
+from notunsplash import Photo, PhotoFrame
+
+np = pytest.importorskip("numpy")
+
+def photos():
+    return [
+        Photo({"id": "a", "width": 1600, "height": 900, "likes": 5, "color": "#ff8000",
+               "created_at": "2024-01-02T03:04:05Z", "user": {"id": "u1", "username": "one"}}),
+        Photo({"id": "b", "width": 1000, "height": 1000, "likes": 20, "color": "#zzzzzz"}),
+        Photo({"id": "c", "width": 800, "height": 0, "likes": 1, "color": None}),
+    ]
+
+def test_columns():
+    frame = PhotoFrame.from_photos(photos(), raw_fields=["color"])
+    assert len(frame) == 3
+    assert frame["id"].tolist() == ["a", "b", "c"]
+    assert frame["likes"].dtype == np.int64
+    assert frame["username"].tolist() == ["one", None, None]
+    assert str(frame["created_at"][0]) == "2024-01-02T03:04:05.000000"
+    assert np.isnat(frame["created_at"][1])
+
+def test_malformed_and_missing_colors_are_black():
+    frame = PhotoFrame.from_photos(photos())
+    assert frame["color_rgb"].tolist() == [[255, 128, 0], [0, 0, 0], [0, 0, 0]]
+
+def test_aspect_ratio_is_nan_without_height():
+    ratio = PhotoFrame.from_photos(photos()).aspect_ratio
+    assert ratio[:2].tolist() == pytest.approx([16 / 9, 1.0])
+    assert np.isnan(ratio[2])
+
+def test_filter_and_sort():
+    frame = PhotoFrame.from_photos(photos())
+    popular = frame.filter(frame["likes"] >= 5).sort_by("likes", descending=True)
+    assert popular["id"].tolist() == ["b", "a"]
+    assert popular["color_rgb"].shape == (2, 3)
+
+def test_columns_must_have_equal_length():
+    with pytest.raises(ValueError):
+        PhotoFrame({"a": np.zeros(2), "b": np.zeros(3)})
@@ -0,0 +1,88 @@
+import threading
+import time
+from notunsplash import HedgePolicy, Unsplash
+from notunsplash.utils import percentile
+
+def warm(policy, count=20):
+    for _ in range(count):
+        policy.call(lambda: "fast")
+
+def test_warm_up_runs_on_the_calling_thread():
+    policy = HedgePolicy(min_samples=5)
+    threads = []
+    policy.call(lambda: threads.append(threading.current_thread()))
+    assert threads == [threading.current_thread()]
+    assert policy.delay() is None
+
+def test_hedge_wins_are_counted():
+    policy = HedgePolicy(min_samples=20, min_delay=0.02, budget=0.5)
+    warm(policy)
+    attempts = []
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            attempts.append(None)
+            first = len(attempts) == 1
+        if first:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    started = time.monotonic()
+    assert policy.call(send) == "hedge"
+    assert time.monotonic() - started < 0.3
+    assert policy.stats["hedged"] == 1
+    assert policy.stats["hedge_wins"] == 1
+
+def test_primary_result_is_used_when_it_answers_first():
+    policy = HedgePolicy(min_samples=20, min_delay=0.02, budget=0.5)
+    warm(policy)
+    attempts = []
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            attempts.append(None)
+            first = len(attempts) == 1
+        time.sleep(0.05 if first else 0.5)
+        return "primary" if first else "hedge"
+
+    assert policy.call(send) == "primary"
+    assert policy.stats["hedged"] == 1
+    assert policy.stats["hedge_wins"] == 0
+
+def test_hedges_stay_within_budget():
+    policy = HedgePolicy(min_samples=20, min_delay=0.01, budget=0.01)
+    warm(policy, 100)
+
+    def slow():
+        time.sleep(0.03)
+        return "slow"
+
+    for _ in range(3):
+        assert policy.call(slow) == "slow"
+    # 1 hedge is allowed in 101 requests; 2 would exceed 1% of 102 and 103
+    assert policy.stats["requests"] == 103
+    assert policy.stats["hedged"] == 1
+    assert policy.stats["over_budget"] == 2
+
+def test_download_tracking_is_never_hedged(make_transport):
+    def api(method, url, params):
+        time.sleep(0.1)
+        return {"id": "abc", "links": {"download_location": "https://api.unsplash.com/photos/abc/download"}}
+
+    policy = HedgePolicy(min_samples=20, min_delay=0.01, budget=1.0)
+    warm(policy)
+    transport = make_transport(api)
+    client = Unsplash("key", transport=transport, hedging=policy)
+    client.download_photo("abc")
+    urls = [request["url"] for request in transport.requests]
+    assert urls.count("https://api.unsplash.com/photos/abc") == 2
+    assert urls.count("https://api.unsplash.com/photos/abc/download") == 1
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+    assert percentile([3.0, 1.0, 2.0], 0.0) == 1.0
+    assert percentile(list(range(1, 101)), 0.95) == 95
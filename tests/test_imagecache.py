@@ -0,0 +1,111 @@
+import io
+import os
+import random
+import pytest
+from notunsplash import Derivative, ImageCache, Photo, UnsplashError
+from notunsplash.transport import Transport, TransportResponse
+
+def jpeg(seed, size=(300, 200)):
+    Image = pytest.importorskip("PIL.Image")
+    rng = random.Random(seed)
+    image = Image.new("RGB", size)
+    image.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(size[0] * size[1])])
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=70)
+    return buffer.getvalue()
+
+class ImageTransport(Transport):
+    """Serves a generated image (or fixed bytes) for every URL"""
+    def __init__(self, content=None):
+        self.content = content
+        self.urls = []
+
+    def request(self, method, url, headers=None, params=None, data=None, timeout=None):
+        self.urls.append(url)
+        return TransportResponse(200, self.content if self.content is not None else jpeg(url))
+
+def photo(photo_id):
+    urls = {"full": f"https://images/{photo_id}", "regular": f"https://images/{photo_id}?w=1080"}
+    return Photo({"id": photo_id, "urls": urls})
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(str(tmp_path), max_bytes=250, transport=ImageTransport(b"x" * 10))
+
+def age(cache, photo_id, variant, seconds):
+    path = cache.path(photo_id, variant)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+def test_put_and_get(cache):
+    cache.put("a", "regular", b"data")
+    with cache.get("a", "regular") as blob:
+        assert blob[:] == b"data"
+    assert cache.get("b", "regular") is None
+
+def test_least_recently_used_blobs_are_evicted(cache):
+    for photo_id, seconds in [("a", 30), ("b", 20)]:
+        cache.put(photo_id, "regular", b"x" * 100)
+        age(cache, photo_id, "regular", seconds)
+    cache.get("a", "regular").close()  # reading refreshes a
+    cache.put("c", "regular", b"x" * 100)
+    assert cache.contains("a", "regular")
+    assert not cache.contains("b", "regular")
+    assert cache.contains("c", "regular")
+    assert cache.size() == 200
+
+def test_overwriting_a_blob_is_not_counted_twice(cache):
+    for _ in range(5):
+        cache.put("a", "regular", b"x" * 100)
+    cache.put("b", "regular", b"x" * 100)
+    assert cache.contains("a", "regular") and cache.contains("b", "regular")
+
+def test_empty_blobs_are_rejected(cache, tmp_path):
+    with pytest.raises(ValueError):
+        cache.put("a", "regular", b"")
+    empty = ImageCache(str(tmp_path / "empty"), transport=ImageTransport(b""))
+    with pytest.raises(UnsplashError):
+        empty.fetch(photo("a"))
+
+def test_empty_file_on_disk_is_treated_as_missing(cache):
+    path = cache.path("a", "regular")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    assert cache.get("a", "regular") is None
+    with cache.fetch(photo("a")) as blob:
+        assert blob[:] == b"x" * 10
+
+def test_fetch_downloads_once(cache):
+    for _ in range(3):
+        cache.fetch(photo("a")).close()
+    assert cache.transport.urls == ["https://images/a?w=1080"]
+
+def test_blobs_removed_by_another_process_are_skipped(cache, monkeypatch):
+    for photo_id in "abc":
+        cache.put(photo_id, "regular", b"x" * 50)
+    entries = list(cache._blobs())
+    os.unlink(entries[0].path)
+    monkeypatch.setattr(cache, "_blobs", lambda: iter(entries))
+    assert cache.size() == 100
+    assert cache.evict(50) == 50
+
+def test_derive_renders_once(tmp_path):
+    pytest.importorskip("PIL")
+    transport = ImageTransport()
+    cache = ImageCache(str(tmp_path), transport=transport)
+    derivative = Derivative(64, 64, crop=True, format="WEBP")
+    for _ in range(2):
+        with cache.derive(photo("a"), derivative) as blob:
+            assert blob[:4] == b"RIFF"
+    assert transport.urls == ["https://images/a"]
+
+def test_derive_many_within_a_small_budget(tmp_path):
+    pytest.importorskip("PIL")
+    source_size = len(jpeg("https://images/p0"))
+    cache = ImageCache(
+        str(tmp_path), max_bytes=source_size * 2, transport=ImageTransport(), workers=2
+    )
+    photos = [photo(f"p{i}") for i in range(4)]
+    paths = cache.derive_many(photos, Derivative(32))
+    assert all(os.path.getsize(path) > 0 for path in paths)
+    assert cache.size() <= cache.max_bytes
@@ -0,0 +1,52 @@
+import gc
+from notunsplash import Collection, Photo, User, UserIdentityMap
+
+def photo_payload(photo_id, user_id="u1", username="someone"):
+    return {"id": photo_id, "user": {"id": user_id, "username": username}}
+
+def test_photos_share_one_user_per_id():
+    users = UserIdentityMap()
+    first = Photo(photo_payload("a"), users)
+    second = Photo(photo_payload("b"), users)
+    other = Photo(photo_payload("c", user_id="u2"), users)
+    assert first.user is second.user
+    assert first.user is not other.user
+    assert len(users) == 2
+    assert "u1" in users
+
+def test_collections_share_users_with_photos():
+    users = UserIdentityMap()
+    photo = Photo(photo_payload("a"), users)
+    collection = Collection({"id": "c", "user": {"id": "u1", "username": "someone"}}, users)
+    assert collection.user is photo.user
+
+def test_without_a_map_users_are_not_shared():
+    assert Photo(photo_payload("a")).user is not Photo(photo_payload("b")).user
+
+def test_users_are_held_weakly():
+    users = UserIdentityMap()
+    photo = Photo(photo_payload("a"), users)
+    assert len(users) == 1
+    del photo
+    gc.collect()
+    assert len(users) == 0
+
+def test_users_without_an_id_are_not_interned():
+    users = UserIdentityMap()
+    assert users.get({"username": "anonymous"}) is not users.get({"username": "anonymous"})
+    assert len(users) == 0
+
+def test_refresh_updates_the_shared_user_in_place():
+    users = UserIdentityMap()
+    photo = Photo(photo_payload("a"), users)
+    profile = users.refresh({"id": "u1", "username": "someone", "total_photos": 42})
+    assert profile is photo.user
+    assert photo.user.total_photos == 42
+
+def test_clear_forgets_users():
+    users = UserIdentityMap()
+    photo = Photo(photo_payload("a"), users)
+    users.clear()
+    assert len(users) == 0
+    assert isinstance(photo.user, User)
+    assert Photo(photo_payload("b"), users).user is not photo.user
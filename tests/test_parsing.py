@@ -0,0 +1,42 @@
+import json
+import pytest
+from notunsplash import Photo, UserIdentityMap, parse_photos
+from notunsplash import parsing
+
+def payloads(count):
+    return [
+        json.dumps({"id": f"p{i}", "width": i, "user": {"id": f"u{i % 3}", "username": f"user{i % 3}"}})
+        for i in range(count)
+    ]
+
+@pytest.fixture
+def no_process_pool(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+    monkeypatch.setattr(parsing, "ProcessPoolExecutor", refuse)
+
+@pytest.mark.parametrize("workers", [0, 1, -1])
+def test_one_worker_or_less_parses_in_process(workers, no_process_pool):
+    photos = list(parse_photos(payloads(5), workers=workers, chunk_size=2))
+    assert [photo.id for photo in photos] == ["p0", "p1", "p2", "p3", "p4"]
+
+def test_accepts_bytes_strings_and_dicts(no_process_pool):
+    raw = [b'{"id": "a"}', '{"id": "b"}', {"id": "c"}]
+    assert [photo.id for photo in parse_photos(raw, workers=1)] == ["a", "b", "c"]
+
+def test_workers_keep_input_order():
+    photos = list(parse_photos(payloads(50), workers=2, chunk_size=7, max_pending=2))
+    assert [photo.id for photo in photos] == [f"p{i}" for i in range(50)]
+    assert all(isinstance(photo, Photo) for photo in photos)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_users_are_interned(workers):
+    users = UserIdentityMap()
+    photos = list(parse_photos(payloads(9), workers=workers, chunk_size=2, users=users))
+    assert photos[0].user is photos[3].user is photos[6].user
+    assert photos[0].user is not photos[1].user
+    assert len(users) == 3
+
+def test_rejects_empty_chunks():
+    with pytest.raises(ValueError):
+        list(parse_photos([], chunk_size=0))
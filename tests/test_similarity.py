@@ -0,0 +1,61 @@
+import pytest
+from notunsplash import ColorIndex, Photo
+
+np = pytest.importorskip("numpy")
+
+def photo(photo_id, color, width=1600, height=900):
+    return Photo({"id": photo_id, "color": color, "width": width, "height": height})
+
+@pytest.fixture
+def index():
+    index = ColorIndex()
+    index.add([
+        photo("red-wide", "#ff0000"),
+        photo("red-square", "#fe0101", 1000, 1000),
+        photo("blue-wide", "#0000ff"),
+        photo("green-tall", "#00ff00", 900, 1600),
+    ])
+    return index
+
+def ids(results):
+    return [photo.id for photo, _ in results]
+
+def test_nearest_colors_first(index):
+    results = index.query("#ff0000", k=2)
+    assert ids(results) == ["red-wide", "red-square"]
+    assert results[0][1] == 0.0 < results[1][1]
+
+def test_aspect_ratio_constraint(index):
+    assert ids(index.query("#ff0000", aspect_ratio=1.0)) == ["red-square"]
+    assert ids(index.query("#ff0000", aspect_ratio=16 / 9, k=5)) == ["red-wide", "blue-wide"]
+    assert index.query("#ff0000", aspect_ratio=3.0) == []
+
+def test_invalid_photos_are_skipped():
+    index = ColorIndex()
+    assert index.add([photo("named", "red"), photo("short", "#f00"), photo("flat", "#ff0000", 10, 0)]) == 0
+    assert len(index) == 0
+
+def test_re_adding_replaces_color_and_shape(index):
+    assert index.add([photo("red-wide", "#0000ff", 1000, 1000)]) == 0
+    assert len(index) == 4
+    assert ids(index.query("#ff0000", k=1)) == ["red-square"]
+    assert ids(index.query("#0000ff", aspect_ratio=1.0)) == ["red-wide", "red-square"]
+    assert "red-wide" not in ids(index.query("#ff0000", aspect_ratio=16 / 9, k=5))
+
+def test_re_adding_keeps_other_rows_intact():
+    index = ColorIndex()
+    index.add([photo(f"p{i}", f"#{i:02x}0000") for i in range(20)])
+    index.add([photo("p0", "#0000ff")])
+    for i in range(1, 20):
+        assert ids(index.query(f"#{i:02x}0000", k=1)) == [f"p{i}"]
+    assert ids(index.query("#0000ff", k=1)) == ["p0"]
+
+@pytest.mark.parametrize("color", ["red", "#abc", "#gggggg", None])
+def test_query_rejects_malformed_colors(index, color):
+    with pytest.raises(ValueError):
+        index.query(color)
+
+@pytest.mark.parametrize("aspect_ratio", [0, -1.0, float("nan")])
+def test_query_rejects_non_positive_aspect_ratio(index, aspect_ratio):
+    with pytest.raises(ValueError):
+        index.query("#ff0000", aspect_ratio=aspect_ratio)
@@ -0,0 +1,77 @@
+import pytest
+import requests
+from notunsplash import HTTP2Transport, RequestsTransport, Unsplash, UnsplashConnectionError, UnsplashTimeoutError
+from notunsplash.transport import TransportResponse
+
+class TimingOutSession(requests.Session):
+    def request(self, *args, **kwargs):
+        raise requests.Timeout("read timed out")
+
+class RefusingSession(requests.Session):
+    def request(self, *args, **kwargs):
+        raise requests.ConnectionError("connection refused")
+
+def test_response_helpers():
+    response = TransportResponse(404, b'{"errors": ["Not found"]}')
+    assert not response.ok
+    assert response.json() == {"errors": ["Not found"]}
+    assert TransportResponse(200, "café".encode("utf-8")).text == "café"
+
+def test_requests_transport_pools_connections():
+    transport = RequestsTransport(pool_maxsize=32)
+    adapter = transport.session.get_adapter("https://api.unsplash.com")
+    assert adapter._pool_maxsize == 32
+
+def test_requests_transport_maps_timeouts():
+    transport = RequestsTransport(session=TimingOutSession())
+    with pytest.raises(UnsplashTimeoutError):
+        transport.request("GET", "https://api.unsplash.com/photos", timeout=0.1)
+
+def test_requests_transport_maps_connection_errors():
+    transport = RequestsTransport(session=RefusingSession())
+    with pytest.raises(UnsplashConnectionError):
+        transport.request("GET", "https://api.unsplash.com/photos")
+
+def test_client_session_is_the_transport_session():
+    client = Unsplash("key")
+    assert client.session is client.transport.session
+
+def test_client_sends_default_headers(make_transport):
+    transport = make_transport(lambda method, url, params: {"id": "abc"})
+    client = Unsplash("key", transport=transport)
+    client.get_photo("abc")
+    request = transport.requests[0]
+    assert request["url"] == "https://api.unsplash.com/photos/abc"
+    assert request["headers"] == {"Accept-Version": "v1", "Authorization": "Client-ID key"}
+
+def test_client_reads_rate_limit_headers():
+    class Limited(RequestsTransport):
+        def request(self, *args, **kwargs):
+            headers = {"X-Ratelimit-Limit": "50", "X-Ratelimit-Remaining": "42"}
+            return TransportResponse(200, b"{}", headers)
+    client = Unsplash("key", transport=Limited())
+    client.get_photo("abc")
+    assert (client.rate_limit, client.rate_limit_remaining) == (50, 42)
+
+def test_http2_transport():
+    httpx = pytest.importorskip("httpx")
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.url.path == "/slow":
+            raise httpx.ReadTimeout("timed out", request=request)
+        if request.url.path == "/down":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"id": "abc"}, headers={"X-Ratelimit-Remaining": "7"})
+
+    transport = HTTP2Transport(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    response = transport.request("GET", "https://api.unsplash.com/photos", params={"page": 2})
+    assert response.ok and response.json() == {"id": "abc"}
+    assert seen[0].url.params["page"] == "2"
+    with pytest.raises(UnsplashTimeoutError):
+        transport.request("GET", "https://api.unsplash.com/slow")
+    with pytest.raises(UnsplashConnectionError):
+        transport.request("GET", "https://api.unsplash.com/down")
+    with pytest.raises(AttributeError):
+        Unsplash("key", transport=transport).session
@@ -0,0 +1,46 @@
+import pytest
+from notunsplash import Photo, Unsplash, UnsplashBatchError, UnsplashError
+
+def api(method, url, params):
+    parts = url.split("/users/", 1)[1].split("/")
+    username = parts[0]
+    if username == "missing":
+        return 404, {"errors": ["Couldn't find User"]}
+    if parts[1:] == ["statistics"]:
+        return {"username": username, "downloads": {"total": 7, "historical": {"change": 2, "values": [
+            {"date": "2026-01-01", "value": 1}
+        ]}}}
+    return {"id": username, "username": username, "total_photos": 3}
+
+@pytest.fixture
+def client(make_transport):
+    return Unsplash("key", transport=make_transport(api))
+
+def test_get_users_fetches_each_username_once(client):
+    users = client.get_users(["a", "b", "a"])
+    assert list(users) == ["a", "b"]
+    assert len(client.transport.requests) == 2
+    assert all(request["timeout"] is None for request in client.transport.requests)
+
+def test_get_user_refreshes_the_interned_user(client):
+    photo = Photo({"id": "p", "user": {"id": "a", "username": "a"}}, client.users)
+    assert client.get_user("a") is photo.user
+    assert photo.user.total_photos == 3
+
+def test_a_failing_user_does_not_stop_the_batch(client):
+    with pytest.raises(UnsplashBatchError) as excinfo:
+        client.get_users(["a", "missing", "b"])
+    assert list(excinfo.value.results) == ["a", "b"]
+    assert list(excinfo.value.errors) == ["missing"]
+    assert isinstance(excinfo.value.errors["missing"], UnsplashError)
+
+def test_get_users_statistics(client):
+    stats = client.get_users_statistics(["a", "b"], resolution="days", quantity=7)
+    assert stats["a"].downloads == 7
+    assert stats["a"].downloads_change == 2
+    assert len(stats["a"].downloads_history) == 1
+    assert client.transport.requests[0]["params"] == {"resolution": "days", "quantity": 7}
+
+def test_empty_batch_sends_nothing(client):
+    assert client.get_users([]) == {}
+    assert client.transport.requests == []
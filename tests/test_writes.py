@@ -0,0 +1,108 @@
+import threading
+import pytest
+from notunsplash import Unsplash, WriteBehindQueue, UnsplashError, UnsplashConnectionError, UnsplashTimeoutError
+
+class Recorder:
+    def __init__(self, fail=None):
+        self.sent = []
+        self.fail = fail or {}
+        self._lock = threading.Lock()
+
+    def __call__(self, authorization, photo_id, like):
+        with self._lock:
+            self.sent.append((authorization, photo_id, like))
+        if photo_id in self.fail:
+            raise self.fail[photo_id]
+
+def started_queue(send, **kwargs):
+    queue = WriteBehindQueue(flush_interval=60, **kwargs)
+    queue.start(send)
+    return queue
+
+def test_repeated_intents_are_coalesced():
+    send = Recorder()
+    queue = started_queue(send)
+    queue.put("Bearer a", "photo", True)
+    queue.put("Bearer a", "photo", True)
+    assert len(queue) == 1
+    assert queue.flush() == 1
+    assert send.sent == [("Bearer a", "photo", True)]
+    assert queue.stats["coalesced"] == 1
+    queue.close()
+
+def test_opposite_intents_cancel_out():
+    send = Recorder()
+    queue = started_queue(send)
+    queue.put("Bearer a", "photo", True)
+    queue.put("Bearer a", "photo", False)
+    assert len(queue) == 0
+    assert queue.flush() == 0
+    assert send.sent == []
+    queue.close()
+
+def test_intents_are_kept_apart_per_token():
+    send = Recorder()
+    queue = started_queue(send)
+    queue.put("Bearer a", "photo", True)
+    queue.put("Bearer b", "photo", False)
+    assert queue.flush() == 2
+    assert sorted(send.sent) == [("Bearer a", "photo", True), ("Bearer b", "photo", False)]
+    queue.close()
+
+def test_flush_on_max_pending():
+    flushed = threading.Event()
+    send = Recorder()
+    queue = started_queue(lambda *args: (send(*args), flushed.set()), max_pending=2)
+    queue.put("Bearer a", "one", True)
+    queue.put("Bearer a", "two", True)
+    assert flushed.wait(5)
+    queue.close()
+    assert sorted(photo_id for _, photo_id, _ in send.sent) == ["one", "two"]
+
+def test_close_sends_pending_and_rejects_new_intents():
+    send = Recorder()
+    queue = started_queue(send)
+    queue.put("Bearer a", "photo", True)
+    queue.close()
+    assert send.sent == [("Bearer a", "photo", True)]
+    with pytest.raises(UnsplashError):
+        queue.put("Bearer a", "other", True)
+
+def test_only_transient_errors_are_retried():
+    errors = []
+    send = Recorder(fail={
+        "gone": UnsplashError("not found", status_code=404),
+        "busy": UnsplashError("unavailable", status_code=503),
+        "limited": UnsplashError("rate limited", status_code=429),
+        "slow": UnsplashTimeoutError("timed out"),
+        "down": UnsplashConnectionError("connection refused"),
+        "full": OSError("disk full"),
+    })
+    queue = started_queue(
+        send, max_retries=2, backoff=0.001,
+        on_error=lambda photo_id, like, error: errors.append(photo_id)
+    )
+    for photo_id in send.fail:
+        queue.put("Bearer a", photo_id, True)
+    assert queue.flush() == 0
+    attempts = [photo_id for _, photo_id, _ in send.sent]
+    assert {photo_id: attempts.count(photo_id) for photo_id in send.fail} == {
+        "gone": 1, "busy": 3, "limited": 3, "slow": 3, "down": 3, "full": 1
+    }
+    assert sorted(errors) == sorted(send.fail)
+    queue.close()
+
+def test_client_likes_go_through_the_queue(transport):
+    queue = WriteBehindQueue(flush_interval=60)
+    client = Unsplash("key", transport=transport, write_queue=queue)
+    client.set_oauth_token("token")
+    client.like_photo("photo")
+    client.unlike_photo("other")
+    assert transport.requests == []
+    client.close()
+    sent = sorted((request["method"], request["url"]) for request in transport.requests)
+    assert sent == [
+        ("DELETE", "https://api.unsplash.com/photos/other/like"),
+        ("POST", "https://api.unsplash.com/photos/photo/like"),
+    ]
+    assert all(request["headers"]["Authorization"] == "Bearer token" for request in transport.requests)